@@ -2,6 +2,26 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 
+_UPSERT_BATCH_STATUS_SQL = text(
+    """
+    INSERT INTO tech.etl_batch_status (dag_id, run_id, parent_run_id, layer, status, attempts, error_message, last_updated_at)
+    VALUES (:dag_id, :run_id, :parent_run_id, :layer, :status,
+            CASE WHEN :status = 'PROCESSING' THEN 1 ELSE 0 END,
+            :error_message,
+            timezone('Europe/Moscow', now()))
+    ON CONFLICT (layer, parent_run_id, run_id) DO UPDATE
+    SET status = EXCLUDED.status,
+        dag_id = EXCLUDED.dag_id,
+        error_message = EXCLUDED.error_message,
+        attempts = CASE
+                       WHEN EXCLUDED.status = 'PROCESSING' THEN tech.etl_batch_status.attempts + 1
+                       ELSE tech.etl_batch_status.attempts
+                   END,
+        last_updated_at = timezone('Europe/Moscow', now())
+    """
+)
+
+
 def log_batch_status(
     engine: Engine,
     dag_id: str,
@@ -11,26 +31,9 @@ def log_batch_status(
     parent_run_id: str,
     error_message: str | None = None,
 ):
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                INSERT INTO tech.etl_batch_status (dag_id, run_id, parent_run_id, layer, status, attempts, error_message, last_updated_at)
-                VALUES (:dag_id, :run_id, :parent_run_id, :layer, :status,
-                        CASE WHEN :status = 'PROCESSING' THEN 1 ELSE 0 END,
-                        :error_message,
-                        timezone('Europe/Moscow', now()))
-                ON CONFLICT (layer, parent_run_id, run_id) DO UPDATE
-                SET status = EXCLUDED.status,
-                    dag_id = EXCLUDED.dag_id,
-                    error_message = EXCLUDED.error_message,
-                    attempts = CASE
-                                   WHEN EXCLUDED.status = 'PROCESSING' THEN tech.etl_batch_status.attempts + 1
-                                   ELSE tech.etl_batch_status.attempts
-                               END,
-                    last_updated_at = timezone('Europe/Moscow', now())
-                """
-            ),
+    log_batch_statuses(
+        engine,
+        [
             {
                 "dag_id": dag_id,
                 "run_id": run_id,
@@ -38,8 +41,18 @@ def log_batch_status(
                 "layer": layer,
                 "status": status,
                 "error_message": error_message,
-            },
-        )
+            }
+        ],
+    )
+
+
+def log_batch_statuses(engine: Engine, entries: list[dict[str, str | None]]) -> None:
+    # Several status changes in one transaction; a list of params runs as a single executemany.
+    if not entries:
+        return
+    params = [{"error_message": None, **entry} for entry in entries]
+    with engine.begin() as conn:
+        conn.execute(_UPSERT_BATCH_STATUS_SQL, params if len(params) > 1 else params[0])
 
 
 def claim_pending_dds_batches(engine: Engine, dag_id: str, dds_run_id: str):
@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 from typing import Any
 
+from psycopg2.extras import execute_values
 from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 
@@ -160,6 +161,59 @@ def log_validation_check(
         )
 
 
+def log_validation_checks_bulk(
+    engine: Engine,
+    *,
+    validation_run_id: int,
+    checks: list[dict[str, Any]],
+) -> None:
+    """Insert several check results in one statement.
+
+    Each item in ``checks`` takes the same keys as the keyword arguments of
+    ``log_validation_check`` (``check_name`` and ``status`` are required).
+    """
+    if not checks:
+        return
+    started_at = datetime.now()
+    values = [
+        (
+            validation_run_id,
+            c["check_name"],
+            c.get("rule_type"),
+            c.get("etl_stage"),
+            c["status"],
+            c.get("severity"),
+            c.get("started_at") or started_at,
+            c.get("finished_at"),
+            c.get("duration_ms"),
+            c.get("rows_failed"),
+            c.get("observed_value"),
+            c.get("expected_value"),
+            c.get("message"),
+            json.dumps(c["details_json"]) if c.get("details_json") else None,
+        )
+        for c in checks
+    ]
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO tech.validation_check_result (
+                    validation_run_id, check_name, rule_type, etl_stage,
+                    status, severity, started_at, finished_at, duration_ms,
+                    rows_failed, observed_value, expected_value, message, details_json
+                )
+                VALUES %s
+                """,
+                values,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
 def delete_validation_runs_for_layer(
     engine: Engine,
     *,
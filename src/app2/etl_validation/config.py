@@ -19,6 +19,7 @@ class ToolsDefaultsConfig:
     include_experiments: bool = True
     only_unprocessed: bool = True
     repeats: int = 1
+    sql_parallel_targets: bool = False
     tools_by_stage: dict[str, list[str]] | None = None
 
 
@@ -111,6 +112,11 @@ def load_tools_experiment_config(path: str | Path) -> ToolsExperimentConfig:
             field="experiment.defaults.repeats",
             default=ToolsDefaultsConfig.repeats,
         ),
+        sql_parallel_targets=_as_bool(
+            defaults_raw.get("sql_parallel_targets"),
+            field="experiment.defaults.sql_parallel_targets",
+            default=ToolsDefaultsConfig.sql_parallel_targets,
+        ),
         tools_by_stage=_as_dict_str_list_str(
             defaults_raw.get("tools_by_stage"),
             field="experiment.defaults.tools_by_stage",
@@ -138,14 +138,6 @@ def run_stage_validation_dbt(
                 kind=t.kind,
             )
 
-            log_batch_status(
-                engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                status="NEW",
-            )
             log_batch_status(
                 engine,
                 dag_id=dag_id,
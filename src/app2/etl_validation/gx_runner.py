@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import operator
 import re
 import time
 import traceback
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -18,10 +18,10 @@ from sqlalchemy.engine import Engine
 from app2.core.config import load_settings
 from app2.db.batch import log_batch_status
 from app2.db.connection import get_engine
-from app2.db.validation_metrics import finish_validation_run, log_validation_check, start_validation_run
+from app2.db.validation_metrics import finish_validation_run, log_validation_checks_bulk, start_validation_run
 from app2.etl_validation.discovery import StageTarget
 from app2.etl_validation.resource_metrics import build_resource_summary, capture_resource_snapshot
-from app2.etl_validation.specs import build_metrics_query, build_stage_checks
+from app2.etl_validation.specs import StageCheck, build_metrics_query, build_stage_checks
 from app2.post_validation.paths import tool_output_dir
 
 
@@ -37,7 +37,7 @@ class StageValidationReport:
 
 
 def _now_tag() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return time.strftime("%Y%m%d_%H%M%S")
 
 
 def _sanitize(value: str) -> str:
@@ -45,13 +45,19 @@ def _sanitize(value: str) -> str:
     return v or "id"
 
 
+_GET_EXPECTATION_TYPE = operator.attrgetter("expectation_config.expectation_type")
+
+
 def _get_expectation_type(item: Any) -> str | None:
+    try:
+        exp_type = _GET_EXPECTATION_TYPE(item)
+    except AttributeError:
+        exp_type = None
+    if exp_type:
+        return exp_type
     cfg = getattr(item, "expectation_config", None)
     if cfg is None:
         return None
-    exp_type = getattr(cfg, "expectation_type", None)
-    if exp_type:
-        return exp_type
     try:
         cfg_dict = cfg.to_json_dict()
         return cfg_dict.get("expectation_type")
@@ -59,6 +65,27 @@ def _get_expectation_type(item: Any) -> str | None:
         return None
 
 
+def _result_column(item: Any) -> str | None:
+    try:
+        return item.expectation_config.kwargs.get("column")
+    except Exception:
+        return None
+
+
+def _pair_results(checks: list[StageCheck], items: list[Any]) -> list[tuple[StageCheck, Any]]:
+    # validate() usually keeps the submission order of expectations, but expectations that error during
+    # graph build or metric resolution are reported first; only trust the order when every column lines up.
+    if len(items) == len(checks) and all(_result_column(item) == spec.name for spec, item in zip(checks, items)):
+        return list(zip(checks, items))
+
+    results_by_metric: dict[str, Any] = {}
+    for item in items:
+        column = _result_column(item)
+        if column:
+            results_by_metric[column] = item
+    return [(spec, results_by_metric.get(spec.name)) for spec in checks]
+
+
 def _add_postgres_datasource(ctx: Any, conn_str: str):
     if hasattr(ctx, "data_sources"):
         return ctx.data_sources.add_postgres(name="postgres", connection_string=conn_str)
@@ -70,8 +97,7 @@ def _add_postgres_datasource(ctx: Any, conn_str: str):
     raise AttributeError("Great Expectations context has no datasource factory")
 
 
-def _fetch_metrics_row(engine: Any, *, stage: str, run_id: str) -> dict[str, Any] | None:
-    query = build_metrics_query(stage, run_id)
+def _fetch_metrics_row(engine: Any, query: str) -> dict[str, Any] | None:
     with engine.connect() as conn:
         row = conn.execute(text(query)).mappings().first()
     return dict(row) if row else None
@@ -130,14 +156,6 @@ def run_stage_validation_gx(
                 kind=t.kind,
             )
 
-            log_batch_status(
-                engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                status="NEW",
-            )
             log_batch_status(
                 engine,
                 dag_id=dag_id,
@@ -159,43 +177,35 @@ def run_stage_validation_gx(
 
             result = v.validate()
             status = "SUCCESS" if result.success else "FAILED"
-            metrics_row = _fetch_metrics_row(engine, stage=stage, run_id=run_id)
-
-            results_by_metric: dict[str, Any] = {}
-            for item in result.results:
-                try:
-                    column = item.expectation_config.kwargs.get("column")
-                except Exception:
-                    column = None
-                if column:
-                    results_by_metric[column] = item
+            metrics_row = _fetch_metrics_row(engine, metrics_query)
 
             failed_checks = 0
-            for spec in checks:
-                item = results_by_metric.get(spec.name)
+            check_rows: list[dict[str, Any]] = []
+            for spec, item in _pair_results(checks, result.results):
                 ok = bool(item.success) if item else False
                 if not ok:
                     failed_checks += 1
                 row_value = metrics_row.get(spec.name) if metrics_row else None
-                log_validation_check(
-                    engine,
-                    validation_run_id=validation_run_id,
-                    check_name=spec.name,
-                    rule_type=spec.rule_group,
-                    etl_stage=stage,
-                    status="PASS" if ok else "FAIL",
-                    severity=spec.severity,
-                    rows_failed=row_value if isinstance(row_value, int) else None,
-                    observed_value=str(row_value) if row_value is not None else None,
-                    expected_value="0",
-                    message=None if ok else "Metric should be 0",
-                    details_json={
-                        "expectation_type": _get_expectation_type(item) if item else None,
-                        "success": bool(item.success) if item else False,
-                        "result": item.result if item else None,
-                        "count_sql": spec.count_sql,
-                    },
+                check_rows.append(
+                    {
+                        "check_name": spec.name,
+                        "rule_type": spec.rule_group,
+                        "etl_stage": stage,
+                        "status": "PASS" if ok else "FAIL",
+                        "severity": spec.severity,
+                        "rows_failed": row_value if isinstance(row_value, int) else None,
+                        "observed_value": str(row_value) if row_value is not None else None,
+                        "expected_value": "0",
+                        "message": None if ok else "Metric should be 0",
+                        "details_json": {
+                            "expectation_type": _get_expectation_type(item) if item else None,
+                            "success": ok,
+                            "result": item.result if item else None,
+                            "count_sql": spec.count_sql,
+                        },
+                    }
                 )
+            log_validation_checks_bulk(engine, validation_run_id=validation_run_id, checks=check_rows)
 
             doc = ValidationResultsPageRenderer().render(result)
             html = DefaultJinjaPageView().render(doc)
@@ -66,16 +66,22 @@ def capture_resource_snapshot() -> ResourceSnapshot:
 def build_resource_summary(start: ResourceSnapshot, end: ResourceSnapshot) -> dict[str, Any]:
     summary: dict[str, Any] = {}
     wall_s = end.wall_time - start.wall_time if end.wall_time and start.wall_time else None
+    cpu_user = end.cpu_user_s - start.cpu_user_s if start.cpu_user_s is not None and end.cpu_user_s is not None else None
+    cpu_sys = end.cpu_sys_s - start.cpu_sys_s if start.cpu_sys_s is not None and end.cpu_sys_s is not None else None
+    # Nothing was readable (e.g. no /proc): skip the per-field checks below.
+    if wall_s is None and cpu_user is None and cpu_sys is None and start.rss_kb is None and end.rss_kb is None and end.hwm_kb is None:
+        return summary
+
     if wall_s is not None:
         summary["wall_time_s"] = round(wall_s, 6)
-
-    if start.cpu_user_s is not None and end.cpu_user_s is not None:
-        summary["cpu_user_s"] = round(end.cpu_user_s - start.cpu_user_s, 6)
-    if start.cpu_sys_s is not None and end.cpu_sys_s is not None:
-        summary["cpu_system_s"] = round(end.cpu_sys_s - start.cpu_sys_s, 6)
-
-    if "cpu_user_s" in summary or "cpu_system_s" in summary:
-        cpu_total = float(summary.get("cpu_user_s", 0.0)) + float(summary.get("cpu_system_s", 0.0))
+    if cpu_user is not None or cpu_sys is not None:
+        cpu_total = 0.0
+        if cpu_user is not None:
+            summary["cpu_user_s"] = round(cpu_user, 6)
+            cpu_total += cpu_user
+        if cpu_sys is not None:
+            summary["cpu_system_s"] = round(cpu_sys, 6)
+            cpu_total += cpu_sys
         summary["cpu_total_s"] = round(cpu_total, 6)
         if wall_s and wall_s > 0:
             summary["cpu_percent_avg"] = round((cpu_total / wall_s) * 100.0, 3)
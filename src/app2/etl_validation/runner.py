@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+import great_expectations as gx
+
 from app2.core.config import load_settings
 from app2.db.batch import delete_batch_status_for_layer
 from app2.db.connection import get_engine
@@ -82,7 +84,6 @@ def run_stage_tool(
     gx_context = None
     gx_datasource = None
     if tool == "gx":
-        import great_expectations as gx
         settings = load_settings()
         conn_str = (
             f"postgresql+psycopg2://{settings.postgres_user}:{settings.postgres_password}"
@@ -130,6 +131,7 @@ def run_stage_tool(
                 output_dir=out_dir,
                 layer=layer,
                 engine=engine,
+                parallel=cfg.defaults.sql_parallel_targets,
             )
         else:
             raise ValueError(f"Unsupported tool: {tool}")
@@ -5,7 +5,6 @@ import re
 import time
 import traceback
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 
 from soda.scan import Scan
@@ -33,7 +32,7 @@ class SodaStageReport:
 
 
 def _now_tag() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return time.strftime("%Y%m%d_%H%M%S")
 
 
 def _sanitize(value: str) -> str:
@@ -125,14 +124,6 @@ def run_stage_validation_soda(
                 kind=t.kind,
             )
 
-            log_batch_status(
-                engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                status="NEW",
-            )
             log_batch_status(
                 engine,
                 dag_id=dag_id,
@@ -152,10 +143,8 @@ def run_stage_validation_soda(
             results = scan.get_scan_results() or {}
 
             results_path = target_dir / f"soda_etl_{stage.lower()}_{safe_kind}_{safe_run}_{tag}.json"
-            results_path.write_text(
-                json.dumps(results, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            with results_path.open("w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
             report_path = str(results_path)
 
             logs_text = scan.get_logs_text()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class StageCheck:
     name: str
     stage: str
@@ -13,16 +17,46 @@ class StageCheck:
     fail_sql: str
 
 
+# One pass over fact_match; each broken reference counts once, as in the per-reference fail_sql.
+_DDS_RI_TEMPLATE = (
+    "SELECT COALESCE(SUM(\n"
+    "    (dc.competition_id IS NULL)::int\n"
+    "  + (ds.season_id IS NULL)::int\n"
+    "  + (fm.home_team_id IS NOT NULL AND ht.team_id IS NULL)::int\n"
+    "  + (fm.away_team_id IS NOT NULL AND at_.team_id IS NULL)::int\n"
+    "), 0)\n"
+    "FROM dds.fact_match fm\n"
+    "LEFT JOIN dds.dim_competition dc ON dc.run_id = fm.run_id AND dc.competition_id = fm.competition_id\n"
+    "LEFT JOIN dds.dim_season ds ON ds.run_id = fm.run_id AND ds.season_id = fm.season_id\n"
+    "LEFT JOIN dds.dim_team ht ON ht.run_id = fm.run_id AND ht.team_id = fm.home_team_id\n"
+    "LEFT JOIN dds.dim_team at_ ON at_.run_id = fm.run_id AND at_.team_id = fm.away_team_id\n"
+    "WHERE fm.run_id = {rid}\n"
+    "  AND (dc.competition_id IS NULL OR ds.season_id IS NULL\n"
+    "       OR (fm.home_team_id IS NOT NULL AND ht.team_id IS NULL)\n"
+    "       OR (fm.away_team_id IS NOT NULL AND at_.team_id IS NULL))"
+)
+
+
+# dds_matchday_out_of_range (GX/Soda stage check) and dds_fact_match_matchday_range (SQL constraint)
+# run the same predicate; both stay so every tool reports it, but the SQL is defined once here.
+_DDS_MATCHDAY_RANGE_PREDICATE = (
+    "FROM dds.fact_match\n"
+    "WHERE run_id = {rid}\n"
+    "  AND matchday IS NOT NULL\n"
+    "  AND (matchday < 0 OR matchday > 60)"
+)
+_DDS_MATCHDAY_RANGE_COUNT = "SELECT COUNT(*)\n" + _DDS_MATCHDAY_RANGE_PREDICATE
+_DDS_MATCHDAY_RANGE_FAIL = "SELECT run_id, match_id, matchday\n" + _DDS_MATCHDAY_RANGE_PREDICATE
+
+
 def _sql_quote(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
 
 
-def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
-    stage = stage.strip().upper()
-    rid = _sql_quote(run_id)
-
+@functools.lru_cache(maxsize=None)
+def _stage_check_templates(stage: str) -> tuple[StageCheck, ...]:
     if stage == "E":
-        return [
+        return (
             StageCheck(
                 name="stg_schema_matches_key_missing",
                 stage=stage,
@@ -32,7 +66,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "SELECT COUNT(*)\n"
                     "FROM stg.raw_football_api\n"
                     "WHERE endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND request_params ->> 'run_id' = {rid}\n"
+                    "  AND request_params ->> 'run_id' = {rid}\n"
                     "  AND http_status BETWEEN 200 AND 299\n"
                     "  AND NOT (response_json ? 'matches')"
                 ),
@@ -40,7 +74,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "SELECT id, endpoint, http_status\n"
                     "FROM stg.raw_football_api\n"
                     "WHERE endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND request_params ->> 'run_id' = {rid}\n"
+                    "  AND request_params ->> 'run_id' = {rid}\n"
                     "  AND http_status BETWEEN 200 AND 299\n"
                     "  AND NOT (response_json ? 'matches')"
                 ),
@@ -55,7 +89,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM stg.raw_football_api s\n"
                     "JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND s.request_params ->> 'run_id' = {rid}\n"
+                    "  AND s.request_params ->> 'run_id' = {rid}\n"
                     "  AND s.http_status BETWEEN 200 AND 299\n"
                     "  AND (m ->> 'id') IS NULL"
                 ),
@@ -64,7 +98,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM stg.raw_football_api s\n"
                     "JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND s.request_params ->> 'run_id' = {rid}\n"
+                    "  AND s.request_params ->> 'run_id' = {rid}\n"
                     "  AND s.http_status BETWEEN 200 AND 299\n"
                     "  AND (m ->> 'id') IS NULL"
                 ),
@@ -79,7 +113,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM stg.raw_football_api s\n"
                     "JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND s.request_params ->> 'run_id' = {rid}\n"
+                    "  AND s.request_params ->> 'run_id' = {rid}\n"
                     "  AND s.http_status BETWEEN 200 AND 299\n"
                     "  AND (\n"
                     "    (m ->> 'matchday') IS NOT NULL\n"
@@ -95,7 +129,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM stg.raw_football_api s\n"
                     "JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"  AND s.request_params ->> 'run_id' = {rid}\n"
+                    "  AND s.request_params ->> 'run_id' = {rid}\n"
                     "  AND s.http_status BETWEEN 200 AND 299\n"
                     "  AND (\n"
                     "    (m ->> 'matchday') IS NOT NULL\n"
@@ -119,7 +153,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "  FROM stg.raw_football_api s\n"
                     "  JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "  WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"    AND s.request_params ->> 'run_id' = {rid}\n"
+                    "    AND s.request_params ->> 'run_id' = {rid}\n"
                     "    AND s.http_status BETWEEN 200 AND 299\n"
                     "    AND (m ->> 'id') IS NOT NULL\n"
                     "  GROUP BY (m ->> 'id')\n"
@@ -133,7 +167,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "  FROM stg.raw_football_api s\n"
                     "  JOIN LATERAL jsonb_array_elements(s.response_json -> 'matches') m ON TRUE\n"
                     "  WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
-                    f"    AND s.request_params ->> 'run_id' = {rid}\n"
+                    "    AND s.request_params ->> 'run_id' = {rid}\n"
                     "    AND s.http_status BETWEEN 200 AND 299\n"
                     "    AND (m ->> 'id') IS NOT NULL\n"
                     "  GROUP BY (m ->> 'id')\n"
@@ -141,10 +175,10 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     ") d"
                 ),
             ),
-        ]
+        )
 
     if stage == "T":
-        return [
+        return (
             StageCheck(
                 name="dds_duplicate_fact_match",
                 stage=stage,
@@ -155,7 +189,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM (\n"
                     "  SELECT run_id, match_id, COUNT(*) AS cnt\n"
                     "  FROM dds.fact_match\n"
-                    f"  WHERE run_id = {rid}\n"
+                    "  WHERE run_id = {rid}\n"
                     "  GROUP BY run_id, match_id\n"
                     "  HAVING COUNT(*) > 1\n"
                     ") d"
@@ -163,7 +197,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 fail_sql=(
                     "SELECT run_id, match_id, COUNT(*) AS cnt\n"
                     "FROM dds.fact_match\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "GROUP BY run_id, match_id\n"
                     "HAVING COUNT(*) > 1"
                 ),
@@ -176,13 +210,13 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 count_sql=(
                     "SELECT COUNT(*)\n"
                     "FROM dds.fact_match\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (home_team_id IS NULL OR away_team_id IS NULL)"
                 ),
                 fail_sql=(
                     "SELECT run_id, match_id, home_team_id, away_team_id\n"
                     "FROM dds.fact_match\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (home_team_id IS NULL OR away_team_id IS NULL)"
                 ),
             ),
@@ -191,50 +225,27 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 stage=stage,
                 rule_group="referential_integrity_violation",
                 severity="error",
-                count_sql=(
-                    "SELECT COUNT(*)\n"
-                    "FROM (\n"
-                    "  SELECT fm.match_id\n"
-                    "  FROM dds.fact_match fm\n"
-                    "  LEFT JOIN dds.dim_competition dc ON dc.run_id = fm.run_id AND dc.competition_id = fm.competition_id\n"
-                    "  WHERE fm.run_id = {rid} AND dc.competition_id IS NULL\n"
-                    "  UNION ALL\n"
-                    "  SELECT fm.match_id\n"
-                    "  FROM dds.fact_match fm\n"
-                    "  LEFT JOIN dds.dim_season ds ON ds.run_id = fm.run_id AND ds.season_id = fm.season_id\n"
-                    "  WHERE fm.run_id = {rid} AND ds.season_id IS NULL\n"
-                    "  UNION ALL\n"
-                    "  SELECT fm.match_id\n"
-                    "  FROM dds.fact_match fm\n"
-                    "  LEFT JOIN dds.dim_team dt ON dt.run_id = fm.run_id AND dt.team_id = fm.home_team_id\n"
-                    "  WHERE fm.run_id = {rid} AND fm.home_team_id IS NOT NULL AND dt.team_id IS NULL\n"
-                    "  UNION ALL\n"
-                    "  SELECT fm.match_id\n"
-                    "  FROM dds.fact_match fm\n"
-                    "  LEFT JOIN dds.dim_team dt ON dt.run_id = fm.run_id AND dt.team_id = fm.away_team_id\n"
-                    "  WHERE fm.run_id = {rid} AND fm.away_team_id IS NOT NULL AND dt.team_id IS NULL\n"
-                    ") d".format(rid=rid)
-                ),
+                count_sql=_DDS_RI_TEMPLATE,
                 fail_sql=(
                     "SELECT 'competition' AS ref_type, fm.match_id\n"
                     "FROM dds.fact_match fm\n"
                     "LEFT JOIN dds.dim_competition dc ON dc.run_id = fm.run_id AND dc.competition_id = fm.competition_id\n"
-                    f"WHERE fm.run_id = {rid} AND dc.competition_id IS NULL\n"
+                    "WHERE fm.run_id = {rid} AND dc.competition_id IS NULL\n"
                     "UNION ALL\n"
                     "SELECT 'season' AS ref_type, fm.match_id\n"
                     "FROM dds.fact_match fm\n"
                     "LEFT JOIN dds.dim_season ds ON ds.run_id = fm.run_id AND ds.season_id = fm.season_id\n"
-                    f"WHERE fm.run_id = {rid} AND ds.season_id IS NULL\n"
+                    "WHERE fm.run_id = {rid} AND ds.season_id IS NULL\n"
                     "UNION ALL\n"
                     "SELECT 'home_team' AS ref_type, fm.match_id\n"
                     "FROM dds.fact_match fm\n"
                     "LEFT JOIN dds.dim_team dt ON dt.run_id = fm.run_id AND dt.team_id = fm.home_team_id\n"
-                    f"WHERE fm.run_id = {rid} AND fm.home_team_id IS NOT NULL AND dt.team_id IS NULL\n"
+                    "WHERE fm.run_id = {rid} AND fm.home_team_id IS NOT NULL AND dt.team_id IS NULL\n"
                     "UNION ALL\n"
                     "SELECT 'away_team' AS ref_type, fm.match_id\n"
                     "FROM dds.fact_match fm\n"
                     "LEFT JOIN dds.dim_team dt ON dt.run_id = fm.run_id AND dt.team_id = fm.away_team_id\n"
-                    f"WHERE fm.run_id = {rid} AND fm.away_team_id IS NOT NULL AND dt.team_id IS NULL"
+                    "WHERE fm.run_id = {rid} AND fm.away_team_id IS NOT NULL AND dt.team_id IS NULL"
                 ),
             ),
             StageCheck(
@@ -242,25 +253,13 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 stage=stage,
                 rule_group="out_of_range",
                 severity="error",
-                count_sql=(
-                    "SELECT COUNT(*)\n"
-                    "FROM dds.fact_match\n"
-                    f"WHERE run_id = {rid}\n"
-                    "  AND matchday IS NOT NULL\n"
-                    "  AND (matchday < 0 OR matchday > 60)"
-                ),
-                fail_sql=(
-                    "SELECT run_id, match_id, matchday\n"
-                    "FROM dds.fact_match\n"
-                    f"WHERE run_id = {rid}\n"
-                    "  AND matchday IS NOT NULL\n"
-                    "  AND (matchday < 0 OR matchday > 60)"
-                ),
+                count_sql=_DDS_MATCHDAY_RANGE_COUNT,
+                fail_sql=_DDS_MATCHDAY_RANGE_FAIL,
             ),
-        ]
+        )
 
     if stage == "L":
-        return [
+        return (
             StageCheck(
                 name="mart_kpi_rate_out_of_bounds",
                 stage=stage,
@@ -269,7 +268,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 count_sql=(
                     "SELECT COUNT(*)\n"
                     "FROM mart.v_competition_season_kpi\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (\n"
                     "    home_win_rate < 0 OR home_win_rate > 1 OR\n"
                     "    draw_rate < 0 OR draw_rate > 1 OR\n"
@@ -279,7 +278,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 fail_sql=(
                     "SELECT run_id, competition_id, season_id, home_win_rate, draw_rate, away_win_rate\n"
                     "FROM mart.v_competition_season_kpi\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (\n"
                     "    home_win_rate < 0 OR home_win_rate > 1 OR\n"
                     "    draw_rate < 0 OR draw_rate > 1 OR\n"
@@ -295,13 +294,13 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 count_sql=(
                     "SELECT COUNT(*)\n"
                     "FROM mart.v_competition_season_kpi\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (start_date IS NULL OR end_date IS NULL OR season_year IS NULL)"
                 ),
                 fail_sql=(
                     "SELECT run_id, competition_id, season_id, start_date, end_date, season_year\n"
                     "FROM mart.v_competition_season_kpi\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "  AND (start_date IS NULL OR end_date IS NULL OR season_year IS NULL)"
                 ),
             ),
@@ -315,7 +314,7 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                     "FROM (\n"
                     "  SELECT run_id, competition_id, season_id, team_id, COUNT(*) AS cnt\n"
                     "  FROM mart.v_team_season_results\n"
-                    f"  WHERE run_id = {rid}\n"
+                    "  WHERE run_id = {rid}\n"
                     "  GROUP BY run_id, competition_id, season_id, team_id\n"
                     "  HAVING COUNT(*) > 1\n"
                     ") d"
@@ -323,24 +322,22 @@ def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
                 fail_sql=(
                     "SELECT run_id, competition_id, season_id, team_id, COUNT(*) AS cnt\n"
                     "FROM mart.v_team_season_results\n"
-                    f"WHERE run_id = {rid}\n"
+                    "WHERE run_id = {rid}\n"
                     "GROUP BY run_id, competition_id, season_id, team_id\n"
                     "HAVING COUNT(*) > 1"
                 ),
             ),
-        ]
+        )
 
-    return []
+    return ()
 
 
-def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
-    stage = stage.strip().upper()
-    rid = _sql_quote(run_id)
-
+@functools.lru_cache(maxsize=None)
+def _constraint_check_templates(stage: str) -> tuple[StageCheck, ...]:
     if stage != "T":
-        return []
+        return ()
 
-    return [
+    return (
         StageCheck(
             name="dds_fact_match_home_away_valid",
             stage=stage,
@@ -349,13 +346,13 @@ def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
             count_sql=(
                 "SELECT COUNT(*)\n"
                 "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND (home_team_id IS NULL OR away_team_id IS NULL OR home_team_id = away_team_id)"
             ),
             fail_sql=(
                 "SELECT run_id, match_id, home_team_id, away_team_id\n"
                 "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND (home_team_id IS NULL OR away_team_id IS NULL OR home_team_id = away_team_id)"
             ),
         ),
@@ -364,20 +361,8 @@ def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
             stage=stage,
             rule_group="sql_constraint",
             severity="error",
-            count_sql=(
-                "SELECT COUNT(*)\n"
-                "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
-                "  AND matchday IS NOT NULL\n"
-                "  AND (matchday < 0 OR matchday > 60)"
-            ),
-            fail_sql=(
-                "SELECT run_id, match_id, matchday\n"
-                "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
-                "  AND matchday IS NOT NULL\n"
-                "  AND (matchday < 0 OR matchday > 60)"
-            ),
+            count_sql=_DDS_MATCHDAY_RANGE_COUNT,
+            fail_sql=_DDS_MATCHDAY_RANGE_FAIL,
         ),
         StageCheck(
             name="dds_fact_match_utc_date_missing",
@@ -387,13 +372,13 @@ def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
             count_sql=(
                 "SELECT COUNT(*)\n"
                 "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND utc_date IS NULL"
             ),
             fail_sql=(
                 "SELECT run_id, match_id, utc_date\n"
                 "FROM dds.fact_match\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND utc_date IS NULL"
             ),
         ),
@@ -405,25 +390,134 @@ def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
             count_sql=(
                 "SELECT COUNT(*)\n"
                 "FROM dds.dim_season\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND (start_date IS NULL OR end_date IS NULL)"
             ),
             fail_sql=(
                 "SELECT run_id, season_id, start_date, end_date\n"
                 "FROM dds.dim_season\n"
-                f"WHERE run_id = {rid}\n"
+                "WHERE run_id = {rid}\n"
                 "  AND (start_date IS NULL OR end_date IS NULL)"
             ),
         ),
+    )
+
+
+def _render_checks(templates: tuple[StageCheck, ...], run_id: str) -> list[StageCheck]:
+    rid = _sql_quote(run_id)
+    return [
+        StageCheck(
+            name=t.name,
+            stage=t.stage,
+            rule_group=t.rule_group,
+            severity=t.severity,
+            count_sql=t.count_sql.replace("{rid}", rid),
+            fail_sql=t.fail_sql.replace("{rid}", rid),
+        )
+        for t in templates
     ]
 
 
-def build_metrics_query(stage: str, run_id: str) -> str:
-    checks = build_stage_checks(stage, run_id)
-    if not checks:
-        raise ValueError(f"No checks defined for stage {stage}.")
+def build_stage_checks(stage: str, run_id: str) -> list[StageCheck]:
+    return _render_checks(_stage_check_templates(stage.strip().upper()), run_id)
+
+
+def has_constraint_checks(stage: str) -> bool:
+    return bool(_constraint_check_templates(stage.strip().upper()))
+
+
+def build_constraint_checks(stage: str, run_id: str) -> list[StageCheck]:
+    return _render_checks(_constraint_check_templates(stage.strip().upper()), run_id)
+
+
+def _metrics_select(checks: tuple[StageCheck, ...]) -> str:
     columns = [f"({c.count_sql}) AS {c.name}" for c in checks]
     return "SELECT\n  " + ",\n  ".join(columns)
 
 
-__all__ = ["StageCheck", "build_stage_checks", "build_constraint_checks", "build_metrics_query"]
+# Same counts as the E checks above, but the matches array is expanded once and shared.
+_STAGE_E_METRICS_TEMPLATE = (
+    "WITH base AS (\n"
+    "  SELECT s.id, s.response_json\n"
+    "  FROM stg.raw_football_api s\n"
+    "  WHERE s.endpoint LIKE 'competitions/%/matches%'\n"
+    "    AND s.request_params ->> 'run_id' = {rid}\n"
+    "    AND s.http_status BETWEEN 200 AND 299\n"
+    "),\n"
+    "exploded AS (\n"
+    "  SELECT b.id, b.response_json, e.m, e.pos\n"
+    "  FROM base b\n"
+    "  LEFT JOIN LATERAL jsonb_array_elements(b.response_json -> 'matches') WITH ORDINALITY AS e(m, pos) ON TRUE\n"
+    ")\n"
+    "SELECT\n"
+    "  COUNT(*) FILTER (WHERE NOT (response_json ? 'matches')) AS stg_schema_matches_key_missing,\n"
+    "  COUNT(*) FILTER (WHERE pos IS NOT NULL AND (m ->> 'id') IS NULL) AS stg_missing_match_id,\n"
+    "  COUNT(*) FILTER (\n"
+    "    WHERE pos IS NOT NULL\n"
+    "      AND (m ->> 'matchday') IS NOT NULL\n"
+    "      AND (\n"
+    "        (m ->> 'matchday') !~ '^\\d+$'\n"
+    "        OR (m ->> 'matchday')::int < 0\n"
+    "        OR (m ->> 'matchday')::int > 60\n"
+    "      )\n"
+    "  ) AS stg_matchday_out_of_range,\n"
+    "  (\n"
+    "    SELECT COUNT(*)\n"
+    "    FROM (\n"
+    "      SELECT (m ->> 'id') AS match_id\n"
+    "      FROM exploded\n"
+    "      WHERE pos IS NOT NULL AND (m ->> 'id') IS NOT NULL\n"
+    "      GROUP BY (m ->> 'id')\n"
+    "      HAVING COUNT(*) > 1\n"
+    "    ) d\n"
+    "  ) AS stg_duplicate_match_id\n"
+    "FROM exploded"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _stage_metrics_template(stage: str) -> str | None:
+    if stage == "E":
+        return _STAGE_E_METRICS_TEMPLATE
+    templates = _stage_check_templates(stage)
+    return _metrics_select(templates) if templates else None
+
+
+@functools.lru_cache(maxsize=None)
+def _constraint_metrics_template(stage: str) -> str | None:
+    templates = _constraint_check_templates(stage)
+    return _metrics_select(templates) if templates else None
+
+
+def build_metrics_query(stage: str, run_id: str) -> str:
+    template = _stage_metrics_template(stage.strip().upper())
+    if template is None:
+        raise ValueError(f"No checks defined for stage {stage}.")
+    return template.replace("{rid}", _sql_quote(run_id))
+
+
+def build_constraint_metrics_query(stage: str, run_id: str) -> str:
+    template = _constraint_metrics_template(stage.strip().upper())
+    if template is None:
+        raise ValueError(f"No constraint checks defined for stage {stage}.")
+    return template.replace("{rid}", _sql_quote(run_id))
+
+
+@functools.lru_cache(maxsize=None)
+def build_constraint_metrics_statement(stage: str) -> TextClause:
+    """Constraint metrics statement with run_id left as a ``:rid`` bind parameter."""
+    template = _constraint_metrics_template(stage.strip().upper())
+    if template is None:
+        raise ValueError(f"No constraint checks defined for stage {stage}.")
+    return text(template.replace("{rid}", ":rid"))
+
+
+__all__ = [
+    "StageCheck",
+    "build_stage_checks",
+    "has_constraint_checks",
+    "build_constraint_checks",
+    "build_metrics_query",
+    "build_constraint_metrics_query",
+    "build_constraint_metrics_statement",
+]
@@ -4,19 +4,25 @@ import json
 import re
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import TextClause
 
 from app2.db.batch import log_batch_status
 from app2.db.connection import get_engine
-from app2.db.validation_metrics import finish_validation_run, log_validation_check, start_validation_run
+from app2.db.validation_metrics import finish_validation_run, log_validation_checks_bulk, start_validation_run
 from app2.etl_validation.discovery import StageTarget
-from app2.etl_validation.resource_metrics import build_resource_summary, capture_resource_snapshot
-from app2.etl_validation.specs import build_constraint_checks
+from app2.etl_validation.resource_metrics import ResourceSnapshot, build_resource_summary, capture_resource_snapshot
+from app2.etl_validation.specs import (
+    StageCheck,
+    build_constraint_checks,
+    build_constraint_metrics_statement,
+    has_constraint_checks,
+)
 from app2.post_validation.paths import tool_output_dir
 
 
@@ -31,200 +37,265 @@ class SqlConstraintStageReport:
     error: str | None = None
 
 
+_TAG_FORMAT = "%Y%m%d_%H%M%S"
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+
+
 def _now_tag() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return time.strftime(_TAG_FORMAT)
 
 
 def _sanitize(value: str) -> str:
-    v = re.sub(r"[^a-zA-Z0-9._-]+", "_", (value or "").strip())
+    v = _SANITIZE_RE.sub("_", (value or "").strip())
     return v or "id"
 
 
-def _scalar_int(engine: Engine, sql: str) -> int:
-    with engine.connect() as conn:
-        value = conn.execute(text(sql)).scalar()
-    return int(value or 0)
+def _write_json(path: Path, payload: dict[str, dict[str, Any] | list[Any]]) -> None:
+    # json.dump with indent writes the encoder's chunks as they are produced; the report is never one big string.
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
-def run_stage_validation_sql(
+def _fetch_counts(conn: Connection, stmt: TextClause, params: dict[str, str]) -> dict[str, int]:
+    try:
+        row = conn.execute(stmt, params).mappings().one()
+    finally:
+        # End the implicit read transaction so a failed target does not poison the next one.
+        conn.rollback()
+    return {name: int(value or 0) for name, value in row.items()}
+
+
+def _build_check_results(
+    checks: list[StageCheck],
+    counts: dict[str, int],
+    *,
+    stage: str,
+) -> tuple[list[dict[str, object]], list[dict[str, Any]], int]:
+    results: list[dict[str, object]] = []
+    check_rows: list[dict[str, Any]] = []
+    checks_failed = 0
+    for spec in checks:
+        count = counts[spec.name]
+        passed = count == 0
+        status = "PASS" if passed else "FAIL"
+        checks_failed += not passed
+        results.append(
+            {
+                "name": spec.name,
+                "rule_group": spec.rule_group,
+                "severity": spec.severity,
+                "status": status,
+                "rows_failed": count,
+            }
+        )
+        check_rows.append(
+            {
+                "check_name": spec.name,
+                "rule_type": spec.rule_group,
+                "etl_stage": stage,
+                "status": status,
+                "severity": spec.severity,
+                "rows_failed": count,
+                "observed_value": str(count),
+                "expected_value": "0",
+                "message": None if passed else "Constraint violation",
+                "details_json": {"check": spec.name},
+            }
+        )
+    return results, check_rows, checks_failed
+
+
+def _add_resources(meta_json: dict[str, Any], resource_start: ResourceSnapshot | None, *, parallel: bool) -> None:
+    if parallel:
+        meta_json["parallel"] = True
+        return
+    if resource_start is None:
+        return
+    resource_summary = build_resource_summary(resource_start, capture_resource_snapshot())
+    if resource_summary:
+        meta_json["resources"] = resource_summary
+
+
+def _validate_target(
+    t: StageTarget,
     *,
     dag_id: str,
     stage: str,
-    targets: list[StageTarget],
     output_dir: Path,
     layer: str,
-    engine: Engine | None = None,
-) -> list[SqlConstraintStageReport]:
-    stage = stage.strip().upper()
-    if engine is None:
-        engine = get_engine()
-    output_dir = tool_output_dir(output_dir, "sql")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    engine: Engine,
+    conn: Connection | None,
+    parallel: bool,
+) -> SqlConstraintStageReport:
+    report_path = None
+    # Resource figures are process-wide, so they only describe this target when targets run one at a time.
+    resource_start = None if parallel else capture_resource_snapshot()
+    run_started = time.time()
+    validation_run_id = None
+    run_id = t.run_id
+    parent_run_id = t.parent_run_id
+    try:
+        tag = _now_tag()
+        safe_run = _sanitize(run_id)
+        safe_kind = _sanitize(t.kind)
+        target_dir = output_dir / f"{safe_kind}_{stage.lower()}_{safe_run}_{tag}"
+        target_dir.mkdir(parents=True, exist_ok=True)
 
-    reports: list[SqlConstraintStageReport] = []
-    for t in targets:
-        report_path = None
-        resource_start = capture_resource_snapshot()
-        run_started = time.time()
-        validation_run_id = None
-        run_id = t.run_id
-        parent_run_id = t.parent_run_id
-        try:
-            tag = _now_tag()
-            safe_run = _sanitize(run_id)
-            safe_kind = _sanitize(t.kind)
-            target_dir = output_dir / f"{safe_kind}_{stage.lower()}_{safe_run}_{tag}"
-            target_dir.mkdir(parents=True, exist_ok=True)
+        validation_run_id = start_validation_run(
+            engine,
+            dag_id=dag_id,
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            layer=layer,
+            tool="sql",
+            suite=f"{stage}_constraints",
+            kind=t.kind,
+        )
+
+        log_batch_status(
+            engine,
+            dag_id=dag_id,
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            layer=layer,
+            status="PROCESSING",
+        )
 
-            validation_run_id = start_validation_run(
+        checks = build_constraint_checks(stage, run_id)
+        stmt = build_constraint_metrics_statement(stage)
+        if conn is not None:
+            counts = _fetch_counts(conn, stmt, {"rid": run_id})
+        else:
+            with engine.connect() as own_conn:
+                counts = _fetch_counts(own_conn, stmt, {"rid": run_id})
+        results, check_rows, checks_failed = _build_check_results(checks, counts, stage=stage)
+        log_validation_checks_bulk(engine, validation_run_id=validation_run_id, checks=check_rows)
+
+        results_path = target_dir / f"sql_constraints_{stage.lower()}_{safe_kind}_{safe_run}_{tag}.json"
+        specs = {spec.name: {"count_sql": spec.count_sql, "fail_sql": spec.fail_sql} for spec in checks}
+        _write_json(results_path, {"checks": results, "specs": specs})
+        report_path = str(results_path)
+
+        status = "SUCCESS" if checks_failed == 0 else "FAILED"
+        log_batch_status(
+            engine,
+            dag_id=dag_id,
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            layer=layer,
+            status=status,
+            error_message=None if status == "SUCCESS" else f"SQL constraints {stage} validation failed",
+        )
+
+        report = SqlConstraintStageReport(
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            stage=stage,
+            kind=t.kind,
+            status=status,
+            report_path=report_path,
+        )
+        if validation_run_id is not None:
+            meta_json = {
+                "checks_total": len(checks),
+                "checks_failed": checks_failed,
+            }
+            _add_resources(meta_json, resource_start, parallel=parallel)
+            finish_validation_run(
                 engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                tool="sql",
-                suite=f"{stage}_constraints",
-                kind=t.kind,
+                validation_run_id=validation_run_id,
+                status=status,
+                duration_ms=int((time.time() - run_started) * 1000),
+                checks_total=len(checks),
+                checks_failed=checks_failed,
+                report_path=report_path,
+                meta_json=meta_json,
             )
-
+        return report
+    except Exception:
+        err = traceback.format_exc()
+        try:
             log_batch_status(
                 engine,
                 dag_id=dag_id,
                 run_id=run_id,
                 parent_run_id=parent_run_id,
                 layer=layer,
-                status="NEW",
+                status="FAILED",
+                error_message=f"SQL constraints {stage} validation error",
             )
-            log_batch_status(
+        except Exception:
+            pass
+        report = SqlConstraintStageReport(
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            stage=stage,
+            kind=t.kind,
+            status="FAILED",
+            report_path=report_path,
+            error=err,
+        )
+        if validation_run_id is not None:
+            meta_json = {"error": err}
+            _add_resources(meta_json, resource_start, parallel=parallel)
+            finish_validation_run(
                 engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                status="PROCESSING",
+                validation_run_id=validation_run_id,
+                status="FAILED",
+                duration_ms=int((time.time() - run_started) * 1000),
+                checks_total=0,
+                checks_failed=0,
+                report_path=report_path,
+                meta_json=meta_json,
             )
+        return report
 
-            checks = build_constraint_checks(stage, run_id)
-            results: list[dict[str, object]] = []
-            checks_failed = 0
-            for spec in checks:
-                count = _scalar_int(engine, spec.count_sql)
-                status = "PASS" if count == 0 else "FAIL"
-                if status != "PASS":
-                    checks_failed += 1
-                results.append(
-                    {
-                        "name": spec.name,
-                        "rule_group": spec.rule_group,
-                        "severity": spec.severity,
-                        "status": status,
-                        "rows_failed": count,
-                        "count_sql": spec.count_sql,
-                        "fail_sql": spec.fail_sql,
-                    }
-                )
-                log_validation_check(
-                    engine,
-                    validation_run_id=validation_run_id,
-                    check_name=spec.name,
-                    rule_type=spec.rule_group,
-                    etl_stage=stage,
-                    status=status,
-                    severity=spec.severity,
-                    rows_failed=count,
-                    observed_value=str(count),
-                    expected_value="0",
-                    message=None if status == "PASS" else "Constraint violation",
-                    details_json={"count_sql": spec.count_sql, "fail_sql": spec.fail_sql},
-                )
-
-            results_path = target_dir / f"sql_constraints_{stage.lower()}_{safe_kind}_{safe_run}_{tag}.json"
-            results_path.write_text(
-                json.dumps({"checks": results}, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
-            report_path = str(results_path)
 
-            status = "SUCCESS" if checks_failed == 0 else "FAILED"
-            log_batch_status(
-                engine,
-                dag_id=dag_id,
-                run_id=run_id,
-                parent_run_id=parent_run_id,
-                layer=layer,
-                status=status,
-                error_message=None if status == "SUCCESS" else f"SQL constraints {stage} validation failed",
-            )
+def run_stage_validation_sql(
+    *,
+    dag_id: str,
+    stage: str,
+    targets: list[StageTarget],
+    output_dir: Path,
+    layer: str,
+    engine: Engine | None = None,
+    parallel: bool = False,
+) -> list[SqlConstraintStageReport]:
+    stage = stage.strip().upper()
+    # Only some stages have SQL constraints; skip the per-target run/batch bookkeeping for the rest.
+    if not targets or not has_constraint_checks(stage):
+        return []
+    if engine is None:
+        engine = get_engine()
+    output_dir = tool_output_dir(output_dir, "sql")
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-            reports.append(
-                SqlConstraintStageReport(
-                    run_id=run_id,
-                    parent_run_id=parent_run_id,
-                    stage=stage,
-                    kind=t.kind,
-                    status=status,
-                    report_path=report_path,
-                )
-            )
-            if validation_run_id is not None:
-                resource_summary = build_resource_summary(resource_start, capture_resource_snapshot())
-                meta_json = {
-                    "checks_total": len(checks),
-                    "checks_failed": checks_failed,
-                }
-                if resource_summary:
-                    meta_json["resources"] = resource_summary
-                finish_validation_run(
-                    engine,
-                    validation_run_id=validation_run_id,
-                    status=status,
-                    duration_ms=int((time.time() - run_started) * 1000),
-                    checks_total=len(checks),
-                    checks_failed=checks_failed,
-                    report_path=report_path,
-                    meta_json=meta_json,
-                )
-        except Exception:
-            err = traceback.format_exc()
-            try:
-                log_batch_status(
-                    engine,
+    if not parallel:
+        with engine.connect() as conn:
+            return [
+                _validate_target(t, dag_id=dag_id, stage=stage, output_dir=output_dir, layer=layer, engine=engine, conn=conn, parallel=False)
+                for t in targets
+            ]
+
+    # Opt-in: targets overlap, so their durations are not comparable with serial runs of the other tools.
+    pool_size = getattr(engine.pool, "size", lambda: 1)()
+    max_workers = max(1, min(len(targets), pool_size))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda t: _validate_target(
+                    t,
                     dag_id=dag_id,
-                    run_id=run_id,
-                    parent_run_id=parent_run_id,
-                    layer=layer,
-                    status="FAILED",
-                    error_message=f"SQL constraints {stage} validation error",
-                )
-            except Exception:
-                pass
-            reports.append(
-                SqlConstraintStageReport(
-                    run_id=run_id,
-                    parent_run_id=parent_run_id,
                     stage=stage,
-                    kind=t.kind,
-                    status="FAILED",
-                    report_path=report_path,
-                    error=err,
-                )
+                    output_dir=output_dir,
+                    layer=layer,
+                    engine=engine,
+                    conn=None,
+                    parallel=True,
+                ),
+                targets,
             )
-            if validation_run_id is not None:
-                resource_summary = build_resource_summary(resource_start, capture_resource_snapshot())
-                meta_json = {"error": err}
-                if resource_summary:
-                    meta_json["resources"] = resource_summary
-                finish_validation_run(
-                    engine,
-                    validation_run_id=validation_run_id,
-                    status="FAILED",
-                    duration_ms=int((time.time() - run_started) * 1000),
-                    checks_total=0,
-                    checks_failed=0,
-                    report_path=report_path,
-                    meta_json=meta_json,
-                )
-    return reports
+        )
 
 
 __all__ = ["SqlConstraintStageReport", "run_stage_validation_sql"]
@@ -1,20 +1,27 @@
 from __future__ import annotations
 
+import functools
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class BaselineConfig:
     stg_run_id: str
     dds_run_id: str | None = None
     snapshot_views: list[str] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IterationConfig:
     name: str
     kind: str
@@ -38,7 +45,7 @@ class IterationConfig:
     snapshot_views: list[str] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DefaultsConfig:
     dag_id_stg: str = "stg_football_raw_app2"
     dag_id_dds: str = "dds_football_load_app2"
@@ -51,7 +58,11 @@ class DefaultsConfig:
     dds_validation_config: str | None = None
 
 
-@dataclass(frozen=True)
+# Slotted classes expose fields, not defaults, as class attributes; read defaults from an instance.
+_DEFAULTS = DefaultsConfig()
+
+
+@dataclass(frozen=True, slots=True)
 class ExperimentConfig:
     name: str
     baseline: BaselineConfig
@@ -59,12 +70,22 @@ class ExperimentConfig:
     iterations: list[IterationConfig]
 
 
+def _all_str(values: Iterable[Any]) -> bool:
+    # Exact type check via C-level map/set; YAML never yields str subclasses.
+    return set(map(type, values)) <= {str}
+
+
 def _as_str(value: Any, *, field: str) -> str:
     if not isinstance(value, str) or not value.strip():
         raise ValueError(f"Config field '{field}' must be a non-empty string.")
     return value.strip()
 
 
+def _opt_str(raw: dict[str, Any], key: str) -> str | None:
+    value = raw.get(key)
+    return value if isinstance(value, str) else None
+
+
 def _as_bool(value: Any, *, field: str, default: bool) -> bool:
     if value is None:
         return default
@@ -84,16 +105,21 @@ def _as_int(value: Any, *, field: str, default: int) -> int:
 def _as_list_str(value: Any, *, field: str) -> list[str] | None:
     if value is None:
         return None
-    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+    if not isinstance(value, list):
         raise ValueError(f"Config field '{field}' must be a list of strings.")
-    items = [v.strip() for v in value if v.strip()]
+    items: list[str] = []
+    for v in value:
+        if not isinstance(v, str):
+            raise ValueError(f"Config field '{field}' must be a list of strings.")
+        if vv := v.strip():
+            items.append(sys.intern(vv))
     return items or None
 
 
 def _as_dict_str_bool(value: Any, *, field: str) -> dict[str, bool] | None:
     if value is None:
         return None
-    if not isinstance(value, dict) or not all(isinstance(k, str) for k in value.keys()):
+    if not isinstance(value, dict) or not _all_str(value.keys()):
         raise ValueError(f"Config field '{field}' must be a mapping of string keys.")
     out: dict[str, bool] = {}
     for k, v in value.items():
@@ -108,23 +134,28 @@ def _as_dict_str_bool(value: Any, *, field: str) -> dict[str, bool] | None:
 def _as_dict_str_list_str(value: Any, *, field: str) -> dict[str, list[str]] | None:
     if value is None:
         return None
-    if not isinstance(value, dict) or not all(isinstance(k, str) for k in value.keys()):
+    if not isinstance(value, dict) or not _all_str(value.keys()):
         raise ValueError(f"Config field '{field}' must be a mapping of string keys to list of strings.")
     out: dict[str, list[str]] = {}
     for k, v in value.items():
-        if not isinstance(v, list) or not all(isinstance(item, str) for item in v):
+        if not isinstance(v, list):
             raise ValueError(f"Config field '{field}.{k}' must be a list of strings.")
+        vv: list[str] = []
+        for item in v:
+            if not isinstance(item, str):
+                raise ValueError(f"Config field '{field}.{k}' must be a list of strings.")
+            if stripped := item.strip():
+                vv.append(sys.intern(stripped))
         kk = k.strip()
-        vv = [item.strip() for item in v if item.strip()]
         if kk:
-            out[kk] = vv
+            out[sys.intern(kk)] = vv
     return out or None
 
 
 def _as_dict_str_str(value: Any, *, field: str) -> dict[str, str] | None:
     if value is None:
         return None
-    if not isinstance(value, dict) or not all(isinstance(k, str) for k in value.keys()):
+    if not isinstance(value, dict) or not _all_str(value.keys()):
         raise ValueError(f"Config field '{field}' must be a mapping of string keys.")
     out: dict[str, str] = {}
     for k, v in value.items():
@@ -137,12 +168,59 @@ def _as_dict_str_str(value: Any, *, field: str) -> dict[str, str] | None:
     return out or None
 
 
+def _as_opt_str(value: Any, *, field: str) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _as_opt_bool(value: Any, *, field: str) -> bool | None:
+    return value if isinstance(value, bool) else None
+
+
+# Optional IterationConfig fields, in declaration order: (key, parser(value, *, field)).
+_ITERATION_FIELDS: tuple[tuple[str, Callable[..., Any]], ...] = (
+    ("from_stg_run_id", _as_opt_str),
+    ("stg_mutations_config", _as_opt_str),
+    ("dds_mutations_config", _as_opt_str),
+    ("stg_validation_config", _as_opt_str),
+    ("dds_validation_config", _as_opt_str),
+    ("stg_mutations_enable", _as_dict_str_list_str),
+    ("dds_mutations_enable", _as_list_str),
+    ("stg_validation_overrides", _as_dict_str_bool),
+    ("dds_validation_overrides", _as_dict_str_bool),
+    ("env", _as_dict_str_str),
+    ("run_stg_validation", functools.partial(_as_bool, default=True)),
+    ("run_dds_validation", functools.partial(_as_bool, default=True)),
+    ("truncate_dds", _as_opt_bool),
+    ("snapshot_views", _as_list_str),
+)
+
+
+_BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Parsed configs keyed by (path, mtime_ns, size); an edited file gets a new key and is re-parsed.
+_CONFIG_CACHE: dict[tuple[Path, int, int], ExperimentConfig] = {}
+_CONFIG_CACHE_MAX = 64
+
+
 def load_experiment_config(path: str | Path) -> ExperimentConfig:
     path = Path(path)
     if not path.is_absolute():
-        base_dir = Path(__file__).resolve().parents[2]  
-        path = base_dir / path
-    raw = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        path = _BASE_DIR / path
+    st = path.stat()
+    key = (path, st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        return cached
+    cfg = _parse_experiment_config(path)
+    if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.pop(next(iter(_CONFIG_CACHE)))
+    _CONFIG_CACHE[key] = cfg
+    return cfg
+
+
+def _parse_experiment_config(path: Path) -> ExperimentConfig:
+    with path.open("rb") as f:
+        raw = yaml.load(f, Loader=_YamlLoader) or {}
     exp = raw.get("experiment") if isinstance(raw, dict) else None
     if not isinstance(exp, dict):
         raise ValueError("Top-level key 'experiment' must be a mapping.")
@@ -154,7 +232,7 @@ def load_experiment_config(path: str | Path) -> ExperimentConfig:
         raise ValueError("Field 'experiment.baseline' must be a mapping.")
     baseline = BaselineConfig(
         stg_run_id=_as_str(baseline_raw.get("stg_run_id"), field="experiment.baseline.stg_run_id"),
-        dds_run_id=baseline_raw.get("dds_run_id") if isinstance(baseline_raw.get("dds_run_id"), str) else None,
+        dds_run_id=_opt_str(baseline_raw, "dds_run_id"),
         snapshot_views=_as_list_str(baseline_raw.get("snapshot_views"), field="experiment.baseline.snapshot_views"),
     )
 
@@ -164,18 +242,18 @@ def load_experiment_config(path: str | Path) -> ExperimentConfig:
     if not isinstance(defaults_raw, dict):
         raise ValueError("Field 'experiment.defaults' must be a mapping.")
     defaults = DefaultsConfig(
-        dag_id_stg=str(defaults_raw.get("dag_id_stg", DefaultsConfig.dag_id_stg)),
-        dag_id_dds=str(defaults_raw.get("dag_id_dds", DefaultsConfig.dag_id_dds)),
-        snapshot_limit=_as_int(defaults_raw.get("snapshot_limit"), field="experiment.defaults.snapshot_limit", default=DefaultsConfig.snapshot_limit),
+        dag_id_stg=str(defaults_raw.get("dag_id_stg", _DEFAULTS.dag_id_stg)),
+        dag_id_dds=str(defaults_raw.get("dag_id_dds", _DEFAULTS.dag_id_dds)),
+        snapshot_limit=_as_int(defaults_raw.get("snapshot_limit"), field="experiment.defaults.snapshot_limit", default=_DEFAULTS.snapshot_limit),
         truncate_dds_before_iteration=_as_bool(
             defaults_raw.get("truncate_dds_before_iteration"),
             field="experiment.defaults.truncate_dds_before_iteration",
-            default=DefaultsConfig.truncate_dds_before_iteration,
+            default=_DEFAULTS.truncate_dds_before_iteration,
         ),
-        stg_mutations_config=defaults_raw.get("stg_mutations_config") if isinstance(defaults_raw.get("stg_mutations_config"), str) else None,
-        dds_mutations_config=defaults_raw.get("dds_mutations_config") if isinstance(defaults_raw.get("dds_mutations_config"), str) else None,
-        stg_validation_config=defaults_raw.get("stg_validation_config") if isinstance(defaults_raw.get("stg_validation_config"), str) else None,
-        dds_validation_config=defaults_raw.get("dds_validation_config") if isinstance(defaults_raw.get("dds_validation_config"), str) else None,
+        stg_mutations_config=_opt_str(defaults_raw, "stg_mutations_config"),
+        dds_mutations_config=_opt_str(defaults_raw, "dds_mutations_config"),
+        stg_validation_config=_opt_str(defaults_raw, "stg_validation_config"),
+        dds_validation_config=_opt_str(defaults_raw, "dds_validation_config"),
     )
 
     iterations_raw = exp.get("iterations", [])
@@ -185,25 +263,10 @@ def load_experiment_config(path: str | Path) -> ExperimentConfig:
     for idx, it in enumerate(iterations_raw, start=1):
         if not isinstance(it, dict):
             raise ValueError(f"Iteration #{idx} must be a mapping.")
-        iterations.append(
-            IterationConfig(
-                name=_as_str(it.get("name", f"iteration_{idx}"), field=f"experiment.iterations[{idx}].name"),
-                kind=_as_str(it.get("kind", "snapshot"), field=f"experiment.iterations[{idx}].kind"),
-                from_stg_run_id=it.get("from_stg_run_id") if isinstance(it.get("from_stg_run_id"), str) else None,
-                stg_mutations_config=it.get("stg_mutations_config") if isinstance(it.get("stg_mutations_config"), str) else None,
-                dds_mutations_config=it.get("dds_mutations_config") if isinstance(it.get("dds_mutations_config"), str) else None,
-                stg_validation_config=it.get("stg_validation_config") if isinstance(it.get("stg_validation_config"), str) else None,
-                dds_validation_config=it.get("dds_validation_config") if isinstance(it.get("dds_validation_config"), str) else None,
-                stg_mutations_enable=_as_dict_str_list_str(it.get("stg_mutations_enable"), field=f"experiment.iterations[{idx}].stg_mutations_enable"),
-                dds_mutations_enable=_as_list_str(it.get("dds_mutations_enable"), field=f"experiment.iterations[{idx}].dds_mutations_enable"),
-                stg_validation_overrides=_as_dict_str_bool(it.get("stg_validation_overrides"), field=f"experiment.iterations[{idx}].stg_validation_overrides"),
-                dds_validation_overrides=_as_dict_str_bool(it.get("dds_validation_overrides"), field=f"experiment.iterations[{idx}].dds_validation_overrides"),
-                env=_as_dict_str_str(it.get("env"), field=f"experiment.iterations[{idx}].env"),
-                run_stg_validation=_as_bool(it.get("run_stg_validation"), field=f"experiment.iterations[{idx}].run_stg_validation", default=True),
-                run_dds_validation=_as_bool(it.get("run_dds_validation"), field=f"experiment.iterations[{idx}].run_dds_validation", default=True),
-                truncate_dds=it.get("truncate_dds") if isinstance(it.get("truncate_dds"), bool) else None,
-                snapshot_views=_as_list_str(it.get("snapshot_views"), field=f"experiment.iterations[{idx}].snapshot_views"),
-            )
-        )
+        prefix = f"experiment.iterations[{idx}]"
+        it_name = _as_str(it.get("name", f"iteration_{idx}"), field=f"{prefix}.name")
+        it_kind = _as_str(it.get("kind", "snapshot"), field=f"{prefix}.kind")
+        fields = {key: parse(it.get(key), field=f"{prefix}.{key}") for key, parse in _ITERATION_FIELDS}
+        iterations.append(IterationConfig(name=it_name, kind=it_kind, **fields))
 
     return ExperimentConfig(name=name, baseline=baseline, defaults=defaults, iterations=iterations)
@@ -1,53 +1,122 @@
 from __future__ import annotations
 
+import functools
 import json
+import weakref
 from typing import Any
 
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import TextClause
+
+
+# FK-safe order (children first). All deletes run as one statement; data-modifying CTEs share a
+# snapshot and FK checks fire at statement end, so the cascade needs a single round-trip.
+_DDS_RUN_TABLES = (
+    "dds.fact_match_score",
+    "dds.fact_match",
+    "dds.fact_standing",
+    "dds.dim_season",
+    "dds.dim_team",
+    "dds.dim_competition",
+    "dds.dim_area",
+)
+_DELETE_DDS_RUN_SQL = text(
+    "WITH "
+    + ",\n     ".join(
+        f"d{i} AS (DELETE FROM {table} WHERE run_id = :run_id RETURNING 1)"
+        for i, table in enumerate(_DDS_RUN_TABLES[:-1], start=1)
+    )
+    + f"\nDELETE FROM {_DDS_RUN_TABLES[-1]} WHERE run_id = :run_id"
+)
+
+# Every DDS table references dim_area through its FK chain, so a run with any DDS rows has a dim_area row.
+_DDS_RUN_EXISTS_SQL = text("SELECT 1 FROM dds.dim_area WHERE run_id = :run_id LIMIT 1")
 
 
 def delete_dds_run(engine: Engine, run_id: str) -> None:
     run_id = (run_id or "").strip()
     if not run_id:
         return
-    ordered_tables = [
-        "dds.fact_match_score",
-        "dds.fact_match",
-        "dds.fact_standing",
-        "dds.dim_season",
-        "dds.dim_team",
-        "dds.dim_competition",
-        "dds.dim_area",
-    ]
     with engine.begin() as conn:
-        for table in ordered_tables:
-            conn.execute(text(f"DELETE FROM {table} WHERE run_id = :run_id"), {"run_id": run_id})
+        if conn.execute(_DDS_RUN_EXISTS_SQL, {"run_id": run_id}).scalar() is None:
+            return
+        conn.execute(_DELETE_DDS_RUN_SQL, {"run_id": run_id})
 
 
-def fetch_view_rows(engine: Engine, view_name: str, limit: int = 200, *, run_id: str | None = None) -> list[dict[str, Any]]:
-    view = view_name.strip()
-    order_by = ""
-    if view.lower() == "mart.v_competition_season_kpi":
-        order_by = " ORDER BY matches_total DESC NULLS LAST"
-    elif view.lower() == "mart.v_team_season_results":
-        order_by = " ORDER BY points_calc DESC NULLS LAST"
+_VIEW_COLUMNS_SQL = text(
+    "SELECT column_name FROM information_schema.columns "
+    "WHERE table_schema = COALESCE(NULLIF(:schema, ''), current_schema()) AND table_name = :name "
+    "ORDER BY ordinal_position"
+)
 
-    with engine.begin() as conn:
-        if run_id is not None:
-            rows = conn.execute(
-                text(f"SELECT * FROM {view} WHERE run_id = :run_id{order_by} LIMIT :limit"),
-                {"run_id": run_id, "limit": limit},
-            ).mappings().all()
-        else:
-            rows = conn.execute(text(f"SELECT * FROM {view}{order_by} LIMIT :limit"), {"limit": limit}).mappings().all()
-    out: list[dict[str, Any]] = []
-    for r in rows:
-        row = dict(r)
-        if run_id is not None and "run_id" in row:
+
+# Column lists per view, per engine; looked up on the caller's connection so a snapshot needs no second checkout.
+# Weak keys let a disposed engine drop its entries.
+_VIEW_COLUMNS: weakref.WeakKeyDictionary[Engine, dict[str, tuple[str, ...]]] = weakref.WeakKeyDictionary()
+
+
+def _view_columns(conn: Connection, view: str) -> tuple[str, ...]:
+    per_engine = _VIEW_COLUMNS.setdefault(conn.engine, {})
+    columns = per_engine.get(view)
+    if columns is None:
+        schema, _, name = view.lower().rpartition(".")
+        columns = tuple(conn.execute(_VIEW_COLUMNS_SQL, {"schema": schema, "name": name}).scalars().all())
+        # Quoted/mixed-case names or views outside current_schema() are not found; retry those next time.
+        if columns:
+            per_engine[view] = columns
+    return columns
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+_STREAM_MIN_ROWS = 1000
+
+_VIEW_ORDER_BY = {
+    "mart.v_competition_season_kpi": " ORDER BY matches_total DESC NULLS LAST",
+    "mart.v_team_season_results": " ORDER BY points_calc DESC NULLS LAST",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _view_rows_statement(view: str, columns: str, by_run: bool) -> TextClause:
+    order_by = _VIEW_ORDER_BY.get(view.lower(), "")
+    where = " WHERE run_id = :run_id" if by_run else ""
+    return text(f"SELECT {columns} FROM {view}{where}{order_by} LIMIT :limit")
+
+
+def fetch_view_rows(
+    bind: Engine | Connection,
+    view_name: str,
+    limit: int = 200,
+    *,
+    run_id: str | None = None,
+) -> list[dict[str, Any]]:
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            return fetch_view_rows(conn, view_name, limit, run_id=run_id)
+    view = view_name.strip()
+    # Large dumps use a server-side cursor so libpq does not buffer the whole result next to the dicts.
+    # psycopg2 named cursors need a real transaction, so autocommit connections keep the default cursor.
+    options: dict[str, Any] = {}
+    if limit >= _STREAM_MIN_ROWS and bind.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        options = {"stream_results": True, "max_row_buffer": _STREAM_MIN_ROWS}
+    if run_id is not None:
+        # run_id is the filter value, so it is projected out in SQL rather than popped from every row.
+        columns = ", ".join(_quote_ident(c) for c in _view_columns(bind, view) if c != "run_id") or "*"
+        stmt, params = _view_rows_statement(view, columns, True), {"run_id": run_id, "limit": limit}
+    else:
+        columns = "*"
+        stmt, params = _view_rows_statement(view, columns, False), {"limit": limit}
+    result = bind.execute(stmt, params, execution_options=options)
+    rows = [dict(r) for r in result.mappings()]
+    if run_id is not None and columns == "*":
+        # Columns could not be resolved up front, so drop the filter column here.
+        for row in rows:
             row.pop("run_id", None)
-        out.append(row)
-    return out
+    return rows
 
 
 def json_dumps_safe(value: Any) -> str:
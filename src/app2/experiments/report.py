@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
+import operator
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from jinja2 import BaseLoader, Environment, select_autoescape
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, select_autoescape
+from markupsafe import Markup, escape
 
 from app2.experiments.db_ops import json_dumps_safe
 
@@ -137,11 +139,6 @@ _TEMPLATE = """<!doctype html>
   {% if result.capabilities %}
     <div class="card">
       <h2>Доступные проверки и мутации</h2>
-      {% set stg_v = result.capabilities.get("validations", {}).get("STG", {}) %}
-      {% set dds_v = result.capabilities.get("validations", {}).get("DDS", {}) %}
-      {% set stg_m = result.capabilities.get("mutations", {}).get("STG", {}).get("entities", []) %}
-      {% set dds_m = result.capabilities.get("mutations", {}).get("DDS", {}).get("entities", []) %}
-
       <div class="grid2">
         <div>
           <h3>STG валидации</h3>
@@ -156,16 +153,10 @@ _TEMPLATE = """<!doctype html>
               </tr>
             </thead>
             <tbody>
-              {% set suite_map = {} %}
-              {% for s in (stg_v.get("suites", []) or []) %}
-                {% for vn in (s.get("validations", []) or []) %}
-                  {% set _ = suite_map.__setitem__(vn, s.get("name")) %}
-                {% endfor %}
-              {% endfor %}
-              {% for name, item in (stg_v.get("items", {}) or {}).items() %}
+              {% for name, item in caps_ctx.stg_items %}
                 <tr>
                   <td class="mono">{{ name }}</td>
-                  <td class="mono">{{ suite_map.get(name, "-") }}</td>
+                  <td class="mono">{{ caps_ctx.stg_suite_map.get(name, "-") }}</td>
                   <td class="mono">{{ item.get("type") or "-" }}</td>
                   <td class="mono">{{ item.get("severity") or "-" }}</td>
                   <td>{{ item.get("description") or "-" }}</td>
@@ -187,16 +178,10 @@ _TEMPLATE = """<!doctype html>
               </tr>
             </thead>
             <tbody>
-              {% set suite_map = {} %}
-              {% for s in (dds_v.get("suites", []) or []) %}
-                {% for vn in (s.get("validations", []) or []) %}
-                  {% set _ = suite_map.__setitem__(vn, s.get("name")) %}
-                {% endfor %}
-              {% endfor %}
-              {% for name, item in (dds_v.get("items", {}) or {}).items() %}
+              {% for name, item in caps_ctx.dds_items %}
                 <tr>
                   <td class="mono">{{ name }}</td>
-                  <td class="mono">{{ suite_map.get(name, "-") }}</td>
+                  <td class="mono">{{ caps_ctx.dds_suite_map.get(name, "-") }}</td>
                   <td class="mono">{{ item.get("type") or "-" }}</td>
                   <td class="mono">{{ item.get("severity") or "-" }}</td>
                   <td>{{ item.get("description") or "-" }}</td>
@@ -219,7 +204,7 @@ _TEMPLATE = """<!doctype html>
               </tr>
             </thead>
             <tbody>
-              {% for e in stg_m %}
+              {% for e in caps_ctx.stg_mutations %}
                 {% set actions = e.get("actions", []) or [] %}
                 {% if actions|length == 0 %}
                   <tr>
@@ -250,7 +235,7 @@ _TEMPLATE = """<!doctype html>
               </tr>
             </thead>
             <tbody>
-              {% for e in dds_m %}
+              {% for e in caps_ctx.dds_mutations %}
                 <tr>
                   <td class="mono">{{ e.get("name") }}</td>
                   <td>{{ e.get("description") or "-" }}</td>
@@ -274,6 +259,7 @@ _TEMPLATE = """<!doctype html>
     </div>
     {% for view in business_views %}
       {% set data = result.baseline.snapshots.get(view) %}
+      {% set cols = view_columns.get(view, []) %}
       <h3>{{ view_titles.get(view, view) }}</h3>
       {% if data is mapping and data.get("error") %}
         <div class="small">Ошибка получения витрины: <span class="mono">{{ data.get("error") }}</span></div>
@@ -281,20 +267,12 @@ _TEMPLATE = """<!doctype html>
         <table>
           <thead>
             <tr>
-              {% for col in view_columns.get(view, []) %}
+              {% for col in cols %}
                 <th class="mono">{{ col }}</th>
               {% endfor %}
             </tr>
           </thead>
-          <tbody>
-            {% for row in data %}
-              <tr>
-                {% for col in view_columns.get(view, []) %}
-                  <td>{{ row.get(col) }}</td>
-                {% endfor %}
-              </tr>
-            {% endfor %}
-          </tbody>
+          <tbody>{{ rows_html(cols, data) }}</tbody>
         </table>
       {% else %}
         <div class="small">Нет строк в витрине.</div>
@@ -389,6 +367,7 @@ _TEMPLATE = """<!doctype html>
             {% for view in business_views %}
               {% set diff = it.comparisons.get(view) %}
               {% if diff %}
+                {% set cols = view_columns.get(view, []) %}
                 <h4>{{ view_titles.get(view, view) }}</h4>
 
                 {% if diff.get("added") and diff.get("added")|length > 0 %}
@@ -396,20 +375,12 @@ _TEMPLATE = """<!doctype html>
                   <table>
                     <thead>
                       <tr>
-                        {% for col in view_columns.get(view, []) %}
+                        {% for col in cols %}
                           <th class="mono">{{ col }}</th>
                         {% endfor %}
                       </tr>
                     </thead>
-                    <tbody>
-                      {% for row in diff.get("added") %}
-                        <tr>
-                          {% for col in view_columns.get(view, []) %}
-                            <td>{{ row.get(col) }}</td>
-                          {% endfor %}
-                        </tr>
-                      {% endfor %}
-                    </tbody>
+                    <tbody>{{ rows_html(cols, diff.get("added")) }}</tbody>
                   </table>
                 {% endif %}
 
@@ -418,20 +389,12 @@ _TEMPLATE = """<!doctype html>
                   <table>
                     <thead>
                       <tr>
-                        {% for col in view_columns.get(view, []) %}
+                        {% for col in cols %}
                           <th class="mono">{{ col }}</th>
                         {% endfor %}
                       </tr>
                     </thead>
-                    <tbody>
-                      {% for row in diff.get("removed") %}
-                        <tr>
-                          {% for col in view_columns.get(view, []) %}
-                            <td>{{ row.get(col) }}</td>
-                          {% endfor %}
-                        </tr>
-                      {% endfor %}
-                    </tbody>
+                    <tbody>{{ rows_html(cols, diff.get("removed")) }}</tbody>
                   </table>
                 {% endif %}
 
@@ -446,15 +409,7 @@ _TEMPLATE = """<!doctype html>
                           {% endfor %}
                         </tr>
                       </thead>
-                      <tbody>
-                        {% for r in diff.get("table", {}).get("rows", []) %}
-                          <tr class="{{ 'row-added' if r.get('row_status') == 'added' else ('row-removed' if r.get('row_status') == 'removed' else '') }}">
-                            {% for c in r.get("cells", []) %}
-                              <td class="{{ 'diff-cell' if c.get('changed') else '' }}">{{ c.get("text") }}</td>
-                            {% endfor %}
-                          </tr>
-                        {% endfor %}
-                      </tbody>
+                      <tbody>{{ diff_table_html(diff.get("table", {}).get("rows", [])) }}</tbody>
                     </table>
                   {% else %}
                     <table>
@@ -530,17 +485,103 @@ _TEMPLATE = """<!doctype html>
 </html>
 """
 
+# Compiled once per process; lexing/parsing the template dominated each render. A named template
+# lets the bytecode cache (per-user temp dir) skip compilation on later process starts as well.
+_ENV = Environment(
+    loader=DictLoader({"report.html": _TEMPLATE}),
+    autoescape=select_autoescape(["html", "xml"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+_COMPILED_TEMPLATE = _ENV.get_template("report.html")
+
 
 def _stable_row_json(row: dict[str, Any]) -> str:
     return json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
 
 
-def _row_key(view: str, row: dict[str, Any]) -> tuple[Any, ...] | None:
-    v = (view or "").strip().lower()
-    fields = _VIEW_KEY_FIELDS.get(v)
-    if not fields:
+def _row_identity(row: dict[str, Any]) -> Any:
+    # Hashable whole-row identity; rows holding unhashable values (JSON arrays/objects) fall back to JSON text.
+    items = tuple(sorted(row.items()))
+    try:
+        hash(items)
+    except TypeError:
+        return _stable_row_json(row)
+    return items
+
+
+def _make_tuple_getter(fields: list[str]) -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    if len(fields) < 2:
+        # itemgetter with a single field returns a bare value, not a tuple.
+        def extract_one(row: dict[str, Any]) -> tuple[Any, ...]:
+            return tuple(row.get(f) for f in fields)
+
+        return extract_one
+
+    get_all = operator.itemgetter(*fields)
+
+    # Snapshot rows are dense (one key per view column), so the C-level itemgetter almost always applies.
+    def extract(row: dict[str, Any]) -> tuple[Any, ...]:
+        try:
+            return get_all(row)
+        except KeyError:
+            return tuple(row.get(f) for f in fields)
+
+    return extract
+
+
+_VIEW_KEY_EXTRACTORS: dict[str, Callable[[dict[str, Any]], tuple[Any, ...]]] = {
+    view: _make_tuple_getter(fields) for view, fields in _VIEW_KEY_FIELDS.items() if fields
+}
+_VIEW_FINGERPRINTS: dict[str, Callable[[dict[str, Any]], tuple[Any, ...]]] = {
+    view: _make_tuple_getter(columns) for view, columns in _VIEW_COLUMNS.items() if columns
+}
+
+
+def _key_extractor(view: str) -> Callable[[dict[str, Any]], tuple[Any, ...]] | None:
+    return _VIEW_KEY_EXTRACTORS.get((view or "").strip().lower())
+
+
+def _fmt_cell(before: Any, after: Any) -> str:
+    if before == after:
+        return "—" if after is None else str(after)
+    if before is None and after is None:
+        return "—"
+    if before is None:
+        a = "—" if after is None else str(after)
+        return f"{a} (— → {a})"
+    if after is None:
+        b = "—" if before is None else str(before)
+        return f"— ({b} → —)"
+    return f"{after} ({before} → {after})"
+
+
+def _sort_keys(keys: list[tuple[Any, ...]]) -> None:
+    # Key tuples are ids and compare natively; NULLs or mixed types fall back to their string form.
+    try:
+        keys.sort()
+    except TypeError:
+        keys.sort(key=str)
+
+
+def _row_fingerprint(view_lower: str) -> Callable[[dict[str, Any]], Any]:
+    # Known views compare by a tuple of their displayed columns (C-level equality, no JSON encoding).
+    return _VIEW_FINGERPRINTS.get(view_lower) or _stable_row_json
+
+
+_BaselineIndex = tuple[dict[tuple[Any, ...], dict[str, Any]], dict[tuple[Any, ...], Any]]
+
+
+# None when the view has no key fields (the diff then falls back to whole-row comparison).
+def _index_baseline(view: str, baseline_rows: list[dict[str, Any]]) -> _BaselineIndex | None:
+    row_key = _key_extractor(view)
+    if row_key is None:
         return None
-    return tuple(row.get(f) for f in fields)
+    keyed = {row_key(row): row for row in baseline_rows}
+    fingerprint = _row_fingerprint(view.lower())
+    return keyed, {key: fingerprint(row) for key, row in keyed.items()}
 
 
 def _diff_view_rows(
@@ -549,58 +590,35 @@ def _diff_view_rows(
     iteration_rows: list[dict[str, Any]],
     *,
     sample_limit: int = 50,
+    baseline_index: _BaselineIndex | None = None,
 ) -> dict[str, Any]:
-    base_keyed: dict[tuple[Any, ...], dict[str, Any]] = {}
-    iter_keyed: dict[tuple[Any, ...], dict[str, Any]] = {}
-    key_supported = True
-
-    for row in baseline_rows:
-        key = _row_key(view, row)
-        if key is None:
-            key_supported = False
-            break
-        base_keyed[key] = row
-
-    if key_supported:
-        for row in iteration_rows:
-            key = _row_key(view, row)
-            if key is None:
-                key_supported = False
-                break
-            iter_keyed[key] = row
-
-    if key_supported:
-        base_keys = set(base_keyed.keys())
-        iter_keys = set(iter_keyed.keys())
-
-        added_keys = sorted(iter_keys - base_keys, key=str)
-        removed_keys = sorted(base_keys - iter_keys, key=str)
-        common_keys = base_keys & iter_keys
-
-        changed = []
-        for key in sorted(common_keys, key=str):
-            if _stable_row_json(base_keyed[key]) != _stable_row_json(iter_keyed[key]):
-                changed.append({"key": key, "baseline": base_keyed[key], "iteration": iter_keyed[key]})
+    if baseline_index is None:
+        baseline_index = _index_baseline(view, baseline_rows)
+    row_key = _key_extractor(view)
 
+    if baseline_index is not None and row_key is not None:
+        base_keyed, base_fp = baseline_index
+        iter_keyed = {row_key(row): row for row in iteration_rows}
         view_lower = view.lower()
         key_fields = set(_VIEW_KEY_FIELDS.get(view_lower) or [])
         columns = _VIEW_COLUMNS.get(view_lower) or []
+        fingerprint = _row_fingerprint(view_lower)
 
-        def _fmt_cell(before: Any, after: Any) -> str:
-            if before == after:
-                return "—" if after is None else str(after)
-            if before is None and after is None:
-                return "—"
-            if before is None:
-                a = "—" if after is None else str(after)
-                return f"{a} (— → {a})"
-            if after is None:
-                b = "—" if before is None else str(before)
-                return f"— ({b} → —)"
-            return f"{after} ({before} → {after})"
+        # Added/removed come from C-level key-view set ops; only shared keys are fingerprinted.
+        added_keys = list(iter_keyed.keys() - base_keyed.keys())
+        removed_keys = list(base_keyed.keys() - iter_keyed.keys())
+        changed_keys = [key for key in iter_keyed.keys() & base_keyed.keys() if base_fp[key] != fingerprint(iter_keyed[key])]
+        _sort_keys(added_keys)
+        _sort_keys(removed_keys)
+        _sort_keys(changed_keys)
+
+        # Only the displayed sample is materialized; the rest of the diff stays as keys.
+        changed = [
+            {"key": key, "baseline": base_keyed[key], "iteration": iter_keyed[key]} for key in changed_keys[:sample_limit]
+        ]
 
         out_changed: list[dict[str, Any]] = []
-        for item in changed[:sample_limit]:
+        for item in changed:
             before = item["baseline"]
             after = item["iteration"]
             key_label = None
@@ -637,7 +655,7 @@ def _diff_view_rows(
         if view_lower == "mart.v_team_season_results" and columns:
             table_rows: list[dict[str, Any]] = []
 
-            for item in changed[:sample_limit]:
+            for item in changed:
                 before = item["baseline"]
                 after = item["iteration"]
                 cells = []
@@ -651,28 +669,27 @@ def _diff_view_rows(
 
         return out
 
-    base_set = {_stable_row_json(r) for r in baseline_rows}
-    iter_set = {_stable_row_json(r) for r in iteration_rows}
-    added = list(iter_set - base_set)
-    removed = list(base_set - iter_set)
+    base_rows = {_row_identity(r): r for r in baseline_rows}
+    iter_rows = {_row_identity(r): r for r in iteration_rows}
     return {
-        "added": [json.loads(s) for s in added[:sample_limit]],
-        "removed": [json.loads(s) for s in removed[:sample_limit]],
+        "added": [r for k, r in iter_rows.items() if k not in base_rows][:sample_limit],
+        "removed": [r for k, r in base_rows.items() if k not in iter_rows][:sample_limit],
         "changed": [],
     }
 
 
+_DDS_PREPARE_STEP = "DDS: подготовка"
+
+
 def _compute_stop_at(it: IterationResult) -> str | None:
-    for s in it.steps:
-        if s.status == "FAILED":
-            if s.name == "DDS: подготовка":
-                continue
-            return s.name
-    return None
+    # A failed DDS cleanup does not stop the iteration, so it is never reported as the stop point.
+    return next((s.name for s in it.steps if s.status == "FAILED" and s.name != _DDS_PREPARE_STEP), None)
 
 
 def _build_comparisons(result: ExperimentResult) -> None:
     base_snaps = result.baseline.snapshots or {}
+    # The baseline is shared by every iteration, so it is keyed and fingerprinted once per view.
+    base_indexes: dict[str, _BaselineIndex | None] = {}
     for it in result.iterations:
         it.stop_at = _compute_stop_at(it)
         if it.status != "SUCCESS" or not it.snapshots:
@@ -691,9 +708,14 @@ def _build_comparisons(result: ExperimentResult) -> None:
 
             if not isinstance(data, list) or not isinstance(base_data, list):
                 continue
+            # Untouched views are the common case; list equality stops at the first differing row.
+            if data is base_data or data == base_data:
+                continue
 
             try:
-                diff = _diff_view_rows(view, base_data, data)
+                if view not in base_indexes:
+                    base_indexes[view] = _index_baseline(view, base_data)
+                diff = _diff_view_rows(view, base_data, data, baseline_index=base_indexes[view])
                 if diff.get("added") or diff.get("removed") or diff.get("changed"):
                     comparisons[view] = diff
             except Exception as e:
@@ -706,16 +728,62 @@ def _build_comparisons(result: ExperimentResult) -> None:
         it.comparisons = comparisons
 
 
+def _rows_html(columns: list[str], rows: list[dict[str, Any]]) -> Markup:
+    # Plain snapshot tables are the bulk of the report; assembling them here skips the nested template loops.
+    return Markup(
+        "".join("<tr>" + "".join(f"<td>{escape(row.get(col))}</td>" for col in columns) + "</tr>" for row in rows)
+    )
+
+
+_ROW_STATUS_CLASSES = {"added": "row-added", "removed": "row-removed"}
+
+
+def _diff_table_html(rows: list[dict[str, Any]]) -> Markup:
+    # Per-cell diff table built as one pre-escaped fragment, like the snapshot tables.
+    return Markup(
+        "".join(
+            f'<tr class="{_ROW_STATUS_CLASSES.get(r.get("row_status"), "")}">'
+            + "".join(
+                f'<td class="{"diff-cell" if c.get("changed") else ""}">{escape(c.get("text"))}</td>'
+                for c in r.get("cells", [])
+            )
+            + "</tr>"
+            for r in rows
+        )
+    )
+
+
+def _suite_map(layer_caps: dict[str, Any]) -> dict[str, Any]:
+    return {vn: s.get("name") for s in (layer_caps.get("suites", []) or []) for vn in (s.get("validations", []) or [])}
+
+
+def _capabilities_context(capabilities: dict[str, Any] | None) -> dict[str, Any]:
+    # Everything the capabilities card reads, resolved once so the template only iterates.
+    caps = capabilities or {}
+    stg_v = caps.get("validations", {}).get("STG", {})
+    dds_v = caps.get("validations", {}).get("DDS", {})
+    return {
+        "stg_items": list((stg_v.get("items", {}) or {}).items()),
+        "dds_items": list((dds_v.get("items", {}) or {}).items()),
+        "stg_suite_map": _suite_map(stg_v),
+        "dds_suite_map": _suite_map(dds_v),
+        "stg_mutations": caps.get("mutations", {}).get("STG", {}).get("entities", []),
+        "dds_mutations": caps.get("mutations", {}).get("DDS", {}).get("entities", []),
+    }
+
+
 def render_html_report(result: ExperimentResult, output_path: Path):
     _build_comparisons(result)
-    env = Environment(loader=BaseLoader(), autoescape=select_autoescape(["html", "xml"]))
-    template = env.from_string(_TEMPLATE)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    html = template.render(
+    stream = _COMPILED_TEMPLATE.stream(
         result=result,
         json_dumps_safe=json_dumps_safe,
         business_views=_BUSINESS_VIEWS,
         view_titles=_VIEW_TITLES,
         view_columns=_VIEW_COLUMNS,
+        rows_html=_rows_html,
+        diff_table_html=_diff_table_html,
+        caps_ctx=_capabilities_context(result.capabilities),
     )
-    output_path.write_text(html, encoding="utf-8")
+    with output_path.open("w", encoding="utf-8") as f:
+        stream.dump(f)
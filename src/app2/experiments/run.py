@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+import functools
 import os
 import re
 import tempfile
@@ -11,8 +13,13 @@ from typing import Any
 import yaml
 from sqlalchemy import bindparam, text
 
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
 from app2.db.connection import get_engine
-from app2.db.batch import log_batch_status
+from app2.db.batch import log_batch_status, log_batch_statuses
 from app2.dds.load_dds import run_dds_load
 from app2.experiments.config import ExperimentConfig, load_experiment_config
 from app2.experiments.db_ops import delete_dds_run, fetch_view_rows
@@ -34,20 +41,34 @@ def _now_tag() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-def _make_run_id(prefix: str, iteration_no: int, layer: str) -> str:
-    return f"{prefix}_i{iteration_no:02d}_{layer.lower()}_{_now_tag()}"
+def _make_run_id(prefix: str, iteration_no: int, layer: str, tag: str) -> str:
+    return f"{prefix}_i{iteration_no:02d}_{layer.lower()}_{tag}"
 
 
 def _set_env(key: str, value: str | None):
+    # Iterations usually repeat the same config paths; skip the putenv/unsetenv when nothing changes.
+    current = os.environ.get(key)
     if value is None or not str(value).strip():
-        os.environ.pop(key, None)
+        if current is not None:
+            del os.environ[key]
         return
-    os.environ[key] = str(value)
+    value = str(value)
+    if current != value:
+        os.environ[key] = value
+
+
+_MODULE_PATH = Path(__file__).resolve()
+
+
+def _yaml_search_roots() -> tuple[Path, ...]:
+    return _search_roots_for(os.environ.get("APP2_REPO_ROOT"))
 
 
-def _yaml_search_roots() -> list[Path]:
-    src_root = Path(__file__).resolve().parents[2]
-    repo_root = Path(os.environ.get("APP2_REPO_ROOT", Path(__file__).resolve().parents[3]))
+# Roots are constant per APP2_REPO_ROOT value, so the realpath calls run once per distinct value.
+@functools.lru_cache(maxsize=4)
+def _search_roots_for(repo_root_env: str | None) -> tuple[Path, ...]:
+    src_root = _MODULE_PATH.parents[2]
+    repo_root = Path(repo_root_env) if repo_root_env is not None else _MODULE_PATH.parents[3]
     roots: list[Path] = [src_root, repo_root, repo_root / "src"]
     seen: set[str] = set()
     unique: list[Path] = []
@@ -57,7 +78,11 @@ def _yaml_search_roots() -> list[Path]:
             continue
         seen.add(key)
         unique.append(root)
-    return unique
+    return tuple(unique)
+
+
+# Successful relative-path lookups per search-root set; misses are not cached so a file created later is found.
+_RESOLVED_YAML_PATHS: dict[tuple[str, tuple[Path, ...]], Path] = {}
 
 
 def _resolve_yaml_path(path: str | None) -> Path | None:
@@ -67,47 +92,81 @@ def _resolve_yaml_path(path: str | None) -> Path | None:
     if raw.is_absolute():
         return raw
 
+    roots = _yaml_search_roots()
+    cache_key = (str(path), roots)
+    cached = _RESOLVED_YAML_PATHS.get(cache_key)
+    if cached is not None:
+        return cached
+
     candidates: list[Path] = []
-    for root in _yaml_search_roots():
+    for root in roots:
         candidates.append(root / raw)
         if raw.parts and raw.parts[0] == "app2":
             candidates.append(root / "src" / raw)
 
     for candidate in candidates:
-        if candidate.exists():
+        if os.path.exists(candidate):
+            _RESOLVED_YAML_PATHS[cache_key] = candidate
             return candidate
     return candidates[0] if candidates else raw
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_yaml_file(path: Path, mtime_ns: int, size: int) -> Any:
+    with path.open("rb") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def _load_yaml_cached(path: Path) -> Any:
+    # Base configs are re-read for every iteration; a file is parsed again only after it changes.
+    # The result is handed out to callers, so each gets its own copy.
+    st = path.stat()
+    return copy.deepcopy(_parse_yaml_file(path, st.st_mtime_ns, st.st_size))
+
+
 def _read_yaml_summary(path: str | None) -> dict[str, Any] | None:
     if not path:
         return None
     p = _resolve_yaml_path(path)
     if p is None:
         return None
-    if not p.exists():
-        return {"path": str(path), "resolved_path": str(p), "error": "file not found"}
     try:
-        data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        # The stat inside _load_yaml_cached doubles as the existence check.
+        data = _load_yaml_cached(p)
         return {"path": str(path), "resolved_path": str(p), "data": data}
+    except FileNotFoundError:
+        return {"path": str(path), "resolved_path": str(p), "error": "file not found"}
     except Exception as e:
         return {"path": str(path), "resolved_path": str(p), "error": str(e)}
 
 
-def _load_yaml_file(path: str | None) -> dict[str, Any]:
-    p = _resolve_yaml_path(path)
-    if p is None or not p.exists():
-        return {}
-    return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+def _load_yaml_shared(path: str | None) -> dict[str, Any]:
+    # The cached parse itself: read-only, callers copy only what they change.
+    key = _yaml_file_key(path)
+    return _parse_yaml_file(*key) if key else {}
+
+
+def _replace_in(cfg: Any, keys: tuple[str, ...], value: Any) -> dict[str, Any]:
+    # Shallow-copies only the mappings along `keys`; untouched sections stay shared with the base config.
+    base = cfg if isinstance(cfg, dict) else {}
+    if len(keys) == 1:
+        return {**base, keys[0]: value}
+    return {**base, keys[0]: _replace_in(base.get(keys[0]), keys[1:], value)}
 
 
 def _write_yaml_file(path: Path, data: dict[str, Any]):
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    path.write_text(yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False), encoding="utf-8")
+
+
+# Generated per-iteration configs are small and short-lived; keep them in tmpfs when the host has one.
+_SCRATCH_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+_SWAP_TEAMS_RE = re.compile(r"swapped home/away teams for (\d+) matches", re.IGNORECASE)
 
 
 def _sanitize_filename(value: str) -> str:
-    v = re.sub(r"[^a-zA-Z0-9._-]+", "_", value.strip())
+    v = _SANITIZE_RE.sub("_", value.strip())
     return v or "cfg"
 
 
@@ -118,24 +177,18 @@ def _materialize_stg_mutations(
     out_dir: Path,
     run_tag: str,
 ) -> str:
-    cfg = _load_yaml_file(base_cfg_path)
-    layers = cfg.setdefault("layers", {})
-    stg = layers.setdefault("STG", {})
-    muts = stg.setdefault("mutations", {})
-    if isinstance(muts, dict):
-        for k, v in muts.items():
-            if isinstance(v, dict):
-                v["enabled"] = False
+    base = _load_yaml_shared(base_cfg_path)
+    # Loaded YAML mappings are always plain dicts, so an exact type check is enough.
+    muts = {k: {**v, "enabled": False} if type(v) is dict else v for k, v in _get_dict(base, "layers", "STG", "mutations").items()}
     for entity, actions in enable.items():
         entry = muts.get(entity)
-        if not isinstance(entry, dict):
-            entry = {}
-            muts[entity] = entry
+        entry = entry if type(entry) is dict else {}
         entry["enabled"] = True
         if actions:
             entry["actions"] = actions
+        muts[entity] = entry
     out_path = out_dir / f"stg_mut_{run_tag}.yml"
-    _write_yaml_file(out_path, cfg)
+    _write_yaml_file(out_path, _replace_in(base, ("layers", "STG", "mutations"), muts))
     return str(out_path)
 
 
@@ -146,22 +199,13 @@ def _materialize_dds_mutations(
     out_dir: Path,
     run_tag: str,
 ) -> str:
-    cfg = _load_yaml_file(base_cfg_path)
-    layers = cfg.setdefault("layers", {})
-    dds = layers.setdefault("DDS", {})
-    muts = dds.setdefault("mutations", {})
-    if isinstance(muts, dict):
-        for k, v in muts.items():
-            if isinstance(v, dict):
-                v["enabled"] = False
+    base = _load_yaml_shared(base_cfg_path)
+    muts = {k: {**v, "enabled": False} if type(v) is dict else v for k, v in _get_dict(base, "layers", "DDS", "mutations").items()}
     for key in enable:
         entry = muts.get(key)
-        if not isinstance(entry, dict):
-            entry = {}
-            muts[key] = entry
-        entry["enabled"] = True
+        muts[key] = {**entry, "enabled": True} if type(entry) is dict else {"enabled": True}
     out_path = out_dir / f"dds_mut_{run_tag}.yml"
-    _write_yaml_file(out_path, cfg)
+    _write_yaml_file(out_path, _replace_in(base, ("layers", "DDS", "mutations"), muts))
     return str(out_path)
 
 
@@ -173,29 +217,33 @@ def _materialize_validations(
     out_dir: Path,
     run_tag: str,
 ) -> str:
-    cfg = _load_yaml_file(base_cfg_path)
-    layers = cfg.setdefault("layers", {})
-    layer_cfg = layers.setdefault(layer, {})
-    validations = layer_cfg.setdefault("validations", {})
-    if isinstance(validations, dict):
-        for name, enabled in overrides.items():
-            v = validations.get(name)
-            if not isinstance(v, dict):
-                v = {}
-                validations[name] = v
-            v["enabled"] = bool(enabled)
+    base = _load_yaml_shared(base_cfg_path)
+    validations = dict(_get_dict(base, "layers", layer, "validations"))
+    for name, enabled in overrides.items():
+        v = validations.get(name)
+        validations[name] = {**v, "enabled": bool(enabled)} if isinstance(v, dict) else {"enabled": bool(enabled)}
     out_path = out_dir / f"{layer.lower()}_val_{run_tag}.yml"
-    _write_yaml_file(out_path, cfg)
+    _write_yaml_file(out_path, _replace_in(base, ("layers", layer, "validations"), validations))
     return str(out_path)
 
 
+_EMPTY: dict[str, Any] = {}
+
+
+def _get_dict(obj: Any, *keys: str) -> dict[str, Any]:
+    # Walks nested config mappings; any missing or non-mapping level yields an empty (shared, read-only) dict.
+    for key in keys:
+        if not isinstance(obj, dict):
+            return _EMPTY
+        obj = obj.get(key)
+    return obj if isinstance(obj, dict) else _EMPTY
+
+
 def _summarize_stg_mutations(path: str | None) -> dict[str, Any] | None:
     raw = _read_yaml_summary(path)
     if not raw or "data" not in raw:
         return raw
-    data = raw["data"]
-    layer = (data.get("layers", {}) or {}).get("STG", {}) if isinstance(data, dict) else {}
-    muts = (layer.get("mutations", {}) or {}) if isinstance(layer, dict) else {}
+    muts = _get_dict(raw["data"], "layers", "STG", "mutations")
     enabled = {}
     for k, v in muts.items():
         if isinstance(v, dict) and v.get("enabled"):
@@ -208,9 +256,7 @@ def _summarize_dds_mutations(path: str | None) -> dict[str, Any] | None:
     raw = _read_yaml_summary(path)
     if not raw or "data" not in raw:
         return raw
-    data = raw["data"]
-    layer = (data.get("layers", {}) or {}).get("DDS", {}) if isinstance(data, dict) else {}
-    muts = (layer.get("mutations", {}) or {}) if isinstance(layer, dict) else {}
+    muts = _get_dict(raw["data"], "layers", "DDS", "mutations")
     enabled = [k for k, v in muts.items() if isinstance(v, dict) and v.get("enabled")]
     raw["enabled"] = enabled
     return raw
@@ -220,9 +266,7 @@ def _summarize_validations(path: str | None, layer_name: str) -> dict[str, Any]
     raw = _read_yaml_summary(path)
     if not raw or "data" not in raw:
         return raw
-    data = raw["data"]
-    layer = (data.get("layers", {}) or {}).get(layer_name, {}) if isinstance(data, dict) else {}
-    vals = (layer.get("validations", {}) or {}) if isinstance(layer, dict) else {}
+    vals = _get_dict(raw["data"], "layers", layer_name, "validations")
     enabled = {}
     for k, v in vals.items():
         if isinstance(v, dict) and v.get("enabled", True):
@@ -233,11 +277,13 @@ def _summarize_validations(path: str | None, layer_name: str) -> dict[str, Any]
 
 def _snapshot(engine, views: list[str], limit: int, *, run_id: str | None) -> dict[str, Any]:
     snapshots: dict[str, Any] = {}
-    for view in views:
-        try:
-            snapshots[view] = fetch_view_rows(engine, view, limit=limit, run_id=run_id)
-        except Exception as e:
-            snapshots[view] = {"error": str(e)}
+    # One pooled connection for all views; autocommit keeps a failing view from aborting the rest.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for view in views:
+            try:
+                snapshots[view] = fetch_view_rows(conn, view, limit=limit, run_id=run_id)
+            except Exception as e:
+                snapshots[view] = {"error": str(e)}
     return snapshots
 
 
@@ -265,20 +311,46 @@ def _run_dds_validations(engine, dag_id: str, dds_run_id: str, parent_run_id: st
     run_dds_rules_suite(engine=engine, dag_id=dag_id, run_id=dds_run_id, parent_run_id=parent_run_id, conn=conn)
 
 
+_YamlFileKey = tuple[Path, int, int]
+
+
+def _yaml_file_key(path: str | None) -> _YamlFileKey | None:
+    p = _resolve_yaml_path(path)
+    if p is None or not p.exists():
+        return None
+    st = p.stat()
+    return p, st.st_mtime_ns, st.st_size
+
+
 def _build_capabilities(
     *,
     stg_validation_config: str | None,
     dds_validation_config: str | None,
     stg_mutations_config: str | None,
     dds_mutations_config: str | None,
+) -> dict[str, Any]:
+    # Rebuilt only when one of the four source files changes; callers get their own copy.
+    return copy.deepcopy(
+        _capabilities_from_files(
+            _yaml_file_key(stg_validation_config),
+            _yaml_file_key(dds_validation_config),
+            _yaml_file_key(stg_mutations_config),
+            _yaml_file_key(dds_mutations_config),
+        )
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _capabilities_from_files(
+    stg_val_key: _YamlFileKey | None,
+    dds_val_key: _YamlFileKey | None,
+    stg_mut_key: _YamlFileKey | None,
+    dds_mut_key: _YamlFileKey | None,
 ) -> dict[str, Any]:
     out: dict[str, Any] = {"validations": {}, "mutations": {}}
 
     def _suites(cfg: dict[str, Any], layer: str) -> list[dict[str, Any]]:
-        layer_cfg = (cfg.get("layers", {}) or {}).get(layer, {}) if isinstance(cfg, dict) else {}
-        suites = (layer_cfg.get("suites", {}) or {}) if isinstance(layer_cfg, dict) else {}
-        if not isinstance(suites, dict):
-            return []
+        suites = _get_dict(cfg, "layers", layer, "suites")
         out_suites: list[dict[str, Any]] = []
         for suite_name, suite_cfg in suites.items():
             if not str(suite_name).strip():
@@ -303,10 +375,7 @@ def _build_capabilities(
         return sorted(out_suites, key=lambda x: x.get("name", ""))
 
     def _validations(cfg: dict[str, Any], layer: str) -> dict[str, Any]:
-        layer_cfg = (cfg.get("layers", {}) or {}).get(layer, {}) if isinstance(cfg, dict) else {}
-        validations = (layer_cfg.get("validations", {}) or {}) if isinstance(layer_cfg, dict) else {}
-        if not isinstance(validations, dict):
-            return {}
+        validations = _get_dict(cfg, "layers", layer, "validations")
         out_vals: dict[str, Any] = {}
         for name, item in validations.items():
             if not str(name).strip() or not isinstance(item, dict):
@@ -320,13 +389,9 @@ def _build_capabilities(
         return out_vals
 
     def _stg_mutations(cfg: dict[str, Any]) -> list[dict[str, Any]]:
-        layer_cfg = (cfg.get("layers", {}) or {}).get("STG", {}) if isinstance(cfg, dict) else {}
-        muts = (layer_cfg.get("mutations", {}) or {}) if isinstance(layer_cfg, dict) else {}
-        action_desc = (layer_cfg.get("action_descriptions", {}) or {}) if isinstance(layer_cfg, dict) else {}
-        if not isinstance(action_desc, dict):
-            action_desc = {}
-        if not isinstance(muts, dict):
-            return []
+        layer_cfg = _get_dict(cfg, "layers", "STG")
+        muts = _get_dict(layer_cfg, "mutations")
+        action_desc = _get_dict(layer_cfg, "action_descriptions")
         out_entities: list[dict[str, Any]] = []
         for entity, item in muts.items():
             if not isinstance(item, dict):
@@ -346,10 +411,7 @@ def _build_capabilities(
         return sorted(out_entities, key=lambda x: x.get("name", ""))
 
     def _dds_mutations(cfg: dict[str, Any]) -> list[dict[str, Any]]:
-        layer_cfg = (cfg.get("layers", {}) or {}).get("DDS", {}) if isinstance(cfg, dict) else {}
-        muts = (layer_cfg.get("mutations", {}) or {}) if isinstance(layer_cfg, dict) else {}
-        if not isinstance(muts, dict):
-            return []
+        muts = _get_dict(cfg, "layers", "DDS", "mutations")
         out_entities: list[dict[str, Any]] = []
         for key, item in muts.items():
             if not str(key).strip() or not isinstance(item, dict):
@@ -357,10 +419,10 @@ def _build_capabilities(
             out_entities.append({"name": str(key), "description": str(item.get("description") or "").strip()})
         return sorted(out_entities, key=lambda x: x.get("name", ""))
 
-    stg_val = _load_yaml_file(stg_validation_config)
-    dds_val = _load_yaml_file(dds_validation_config)
-    stg_mut = _load_yaml_file(stg_mutations_config)
-    dds_mut = _load_yaml_file(dds_mutations_config)
+    # Only read here, so the shared parse cache can be used without copying.
+    stg_val, dds_val, stg_mut, dds_mut = (
+        _parse_yaml_file(*key) if key else {} for key in (stg_val_key, dds_val_key, stg_mut_key, dds_mut_key)
+    )
 
     out["validations"]["STG"] = {"suites": _suites(stg_val, "STG"), "items": _validations(stg_val, "STG")}
     out["validations"]["DDS"] = {"suites": _suites(dds_val, "DDS"), "items": _validations(dds_val, "DDS")}
@@ -370,8 +432,6 @@ def _build_capabilities(
 
 
 def _format_mutation_messages(rows: list[tuple[str, str | None]], limit: int = 8) -> str | None:
-    swap_teams_re = re.compile(r"swapped home/away teams for (\d+) matches", re.IGNORECASE)
-
     items: list[str] = []
     seen = set()
     for entity, msg in rows:
@@ -387,8 +447,8 @@ def _format_mutation_messages(rows: list[tuple[str, str | None]], limit: int = 8
         if entity and msg.lower().startswith(f"{entity.lower()}:"):
             msg = msg[len(entity) + 1 :].strip()
 
-        m = swap_teams_re.search(msg)
-        if entity == "matches" and m:
+        m = _SWAP_TEAMS_RE.search(msg) if entity == "matches" else None
+        if m:
             msg = f"swap_teams ({m.group(1)} матчей)"
         key = (entity, msg)
         if key in seen:
@@ -404,17 +464,55 @@ def _format_mutation_messages(rows: list[tuple[str, str | None]], limit: int = 8
     return "; ".join(items) + more
 
 
-def _collect_validation_time_summary(
-    *,
-    engine,
-    capabilities: dict[str, Any] | None,
-    iterations: list[IterationResult],
-) -> list[dict[str, Any]]:
-    if not capabilities:
-        return []
-
+_STG_MUTATION_AUDIT_STMT = text(
+    """
+    SELECT entity_name, message
+    FROM tech.etl_load_audit
+    WHERE run_id = :run_id
+      AND layer = 'STG'
+      AND status = 'MUTATED'
+      AND entity_name LIKE 'STG_mutation_%'
+    ORDER BY audit_id DESC
+    LIMIT 50
+    """
+)
+_DDS_MUTATION_AUDIT_STMT = text(
+    """
+    SELECT message
+    FROM tech.etl_load_audit
+    WHERE run_id = :run_id
+      AND layer = 'DDS'
+      AND entity_name = 'DDS_mutation'
+      AND status = 'MUTATED'
+    ORDER BY audit_id DESC
+    LIMIT 1
+    """
+)
+_AUDIT_TIME_SUM_STMT = text(
+    """
+    SELECT layer,
+           run_id,
+           entity_name,
+           SUM(EXTRACT(EPOCH FROM (finished_at - started_at))) AS seconds_sum
+    FROM tech.etl_load_audit
+    WHERE layer IN :layers
+      AND status IN ('SUCCESS','FAILED')
+      AND started_at IS NOT NULL
+      AND finished_at IS NOT NULL
+      AND run_id IN :run_ids
+      AND entity_name IN :entities
+    GROUP BY layer, run_id, entity_name
+    """
+).bindparams(
+    bindparam("layers", expanding=True),
+    bindparam("run_ids", expanding=True),
+    bindparam("entities", expanding=True),
+)
+
+
+def _suite_index(capabilities: dict[str, Any]) -> dict[tuple[str, str], str]:
+    # (layer, audit entity) -> suite name; the entity set per layer is just its keys.
     suite_map: dict[tuple[str, str], str] = {}
-    suite_entities: dict[str, list[str]] = {"STG": [], "DDS": []}
     for layer in ("STG", "DDS"):
         suites = (capabilities.get("validations", {}) or {}).get(layer, {}).get("suites", []) if isinstance(capabilities, dict) else []
         if not isinstance(suites, list):
@@ -427,57 +525,66 @@ def _collect_validation_time_summary(
             if not suite_name or not entity:
                 continue
             suite_map[(layer, entity)] = suite_name
-            suite_entities[layer].append(entity)
-
-    stmt = (
-        text(
-            """
-            SELECT run_id,
-                   entity_name,
-                   SUM(EXTRACT(EPOCH FROM (finished_at - started_at))) AS seconds_sum
-            FROM tech.etl_load_audit
-            WHERE layer = :layer
-              AND status IN ('SUCCESS','FAILED')
-              AND started_at IS NOT NULL
-              AND finished_at IS NOT NULL
-              AND run_id = :run_id
-              AND entity_name IN :entities
-            GROUP BY run_id, entity_name
-            """
-        )
-        .bindparams(bindparam("entities", expanding=True))
-    )
+    return suite_map
+
+
+def _collect_validation_time_summary(
+    *,
+    engine,
+    capabilities: dict[str, Any] | None,
+    iterations: list[IterationResult],
+) -> list[dict[str, Any]]:
+    if not capabilities:
+        return []
+
+    suite_map = _suite_index(capabilities)
+    suite_layers = {layer for layer, _ in suite_map}
+
+    # (layer, run_id) -> iterations that own it; all of them are fetched in one round trip.
+    run_owners: dict[tuple[str, str], list[IterationResult]] = {}
+    for it in iterations:
+        for layer, run_id in (("STG", it.stg_run_id), ("DDS", it.dds_run_id)):
+            if run_id and layer in suite_layers:
+                run_owners.setdefault((layer, run_id), []).append(it)
+    if not run_owners:
+        return []
+
+    params = {
+        "layers": sorted({layer for layer, _ in run_owners}),
+        "run_ids": sorted({run_id for _, run_id in run_owners}),
+        "entities": sorted({entity for _, entity in suite_map}),
+    }
 
     out: list[dict[str, Any]] = []
     with engine.begin() as conn:
-        for it in iterations:
-            for layer, run_id in (("STG", it.stg_run_id), ("DDS", it.dds_run_id)):
-                if not run_id:
-                    continue
-            entities = suite_entities.get(layer) or []
-            if not entities:
-                continue
-            rows = conn.execute(stmt, {"layer": layer, "run_id": run_id, "entities": entities}).mappings().all()
-            for r in rows:
-                entity = str(r.get("entity_name") or "")
-                seconds_sum = float(r.get("seconds_sum") or 0.0)
-                out.append(
-                    {
-                        "iteration_no": it.iteration_no,
-                        "iteration_name": it.name,
-                        "layer": layer,
-                        "suite": suite_map.get((layer, entity), entity),
-                        "entity": entity,
-                        "run_id": run_id,
-                        "seconds_sum": round(seconds_sum, 3),
-                    }
-                )
+        rows = conn.execute(_AUDIT_TIME_SUM_STMT, params).mappings().all()
+    for r in rows:
+        layer = str(r.get("layer") or "")
+        run_id = str(r.get("run_id") or "")
+        entity = str(r.get("entity_name") or "")
+        # The IN lists cross layers, run ids and entities; keep only the requested combinations.
+        owners = run_owners.get((layer, run_id))
+        if not owners or (layer, entity) not in suite_map:
+            continue
+        seconds_sum = round(float(r.get("seconds_sum") or 0.0), 3)
+        for it in owners:
+            out.append(
+                {
+                    "iteration_no": it.iteration_no,
+                    "iteration_name": it.name,
+                    "layer": layer,
+                    "suite": suite_map[(layer, entity)],
+                    "entity": entity,
+                    "run_id": run_id,
+                    "seconds_sum": seconds_sum,
+                }
+            )
     return sorted(out, key=lambda x: (int(x.get("iteration_no") or 0), x.get("layer", ""), x.get("suite", "")))
 
 
 def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
     engine = get_engine()
-    gen_dir = Path(tempfile.mkdtemp(prefix=f"app2_experiment_{_sanitize_filename(cfg.name)}_"))
+    gen_dir = Path(tempfile.mkdtemp(prefix=f"app2_experiment_{_sanitize_filename(cfg.name)}_", dir=_SCRATCH_ROOT))
 
     snapshot_views = cfg.baseline.snapshot_views or [
         "mart.v_competition_season_kpi",
@@ -515,6 +622,8 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
         status = "SUCCESS"
         err: str | None = None
         steps: list[StepResult] = []
+        # First step recorded under each name, for O(1) detail updates.
+        step_index: dict[str, StepResult] = {}
         snapshots: dict[str, Any] = {}
         expected: list[tuple[str, str | None]] = []
 
@@ -525,7 +634,9 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
         stg_val_cfg = it_cfg.stg_validation_config or cfg.defaults.stg_validation_config
         dds_val_cfg = it_cfg.dds_validation_config or cfg.defaults.dds_validation_config
 
-        run_tag = f"i{idx:02d}_{_now_tag()}"
+        # One timestamp per iteration, shared by generated config names and run ids.
+        tag = _now_tag()
+        run_tag = f"i{idx:02d}_{tag}"
         if it_cfg.stg_mutations_enable:
             stg_mut_cfg = _materialize_stg_mutations(
                 base_cfg_path=stg_mut_cfg,
@@ -591,29 +702,30 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                 return "валидации отключены"
             return f"проверок: {len(enabled)}"
 
+        def _add_step(step: StepResult):
+            steps.append(step)
+            step_index.setdefault(step.name, step)
+
         def _run_step(name: str, fn, *, skipped: bool = False, details: str | None = None):
             if skipped:
-                steps.append(StepResult(name=name, status="SKIPPED", details=details))
+                _add_step(StepResult(name=name, status="SKIPPED", details=details))
                 return None
             try:
                 result0 = fn()
-                steps.append(StepResult(name=name, status="SUCCESS", details=details))
+                _add_step(StepResult(name=name, status="SUCCESS", details=details))
                 return result0
             except Exception:
-                steps.append(StepResult(name=name, status="FAILED", details=details, error=traceback.format_exc()))
+                _add_step(StepResult(name=name, status="FAILED", details=details, error=traceback.format_exc()))
                 raise
 
         def _append_step_details(step_name: str, extra: str):
             extra = (extra or "").strip()
             if not extra:
                 return
-            for s in steps:
-                if s.name == step_name:
-                    if s.details:
-                        s.details = f"{s.details}; {extra}"
-                    else:
-                        s.details = extra
-                    return
+            s = step_index.get(step_name)
+            if s is None:
+                return
+            s.details = f"{s.details}; {extra}" if s.details else extra
 
         prev_env: dict[str, str | None] = {}
         try:
@@ -625,15 +737,14 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
             prev_env = {}
 
         def _finalize_steps():
-            existing = {s.name for s in steps}
             failed = any(s.status == "FAILED" for s in steps)
             for step_name, step_details in expected:
-                if step_name in existing:
+                if step_name in step_index:
                     continue
                 if failed:
-                    steps.append(StepResult(name=step_name, status="SKIPPED", details=step_details or "не выполнено из-за ошибки на предыдущем шаге"))
+                    _add_step(StepResult(name=step_name, status="SKIPPED", details=step_details or "не выполнено из-за ошибки на предыдущем шаге"))
                 else:
-                    steps.append(StepResult(name=step_name, status="SKIPPED", details=step_details))
+                    _add_step(StepResult(name=step_name, status="SKIPPED", details=step_details))
 
         try:
             kind = it_cfg.kind.strip().lower()
@@ -654,8 +765,8 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
 
             elif kind == "stg_mutation":
                 src_run = _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id)
-                stg_run_id = _make_run_id(prefix, idx, "stg")
-                dds_run_id = _make_run_id(prefix, idx, "dds")
+                stg_run_id = _make_run_id(prefix, idx, "stg", tag)
+                dds_run_id = _make_run_id(prefix, idx, "dds", tag)
 
                 expected = [
                     ("STG: raw слой", f"используется baseline stg_run_id={src_run}"),
@@ -684,21 +795,7 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                 )
                 try:
                     with engine.begin() as conn:
-                        rows = conn.execute(
-                            text(
-                                """
-                                SELECT entity_name, message
-                                FROM tech.etl_load_audit
-                                WHERE run_id = :run_id
-                                  AND layer = 'STG'
-                                  AND status = 'MUTATED'
-                                  AND entity_name LIKE 'STG_mutation_%'
-                                ORDER BY audit_id DESC
-                                LIMIT 50
-                                """
-                            ),
-                            {"run_id": stg_run_id},
-                        ).fetchall()
+                        rows = conn.execute(_STG_MUTATION_AUDIT_STMT, {"run_id": stg_run_id}).fetchall()
                     msg = _format_mutation_messages([(r[0], r[1]) for r in rows])
                     if msg:
                         _append_step_details("STG: мутация", msg)
@@ -710,11 +807,16 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                     skipped=not it_cfg.run_stg_validation,
                     details=expected[2][1] if it_cfg.run_stg_validation else "отключено в конфиге эксперимента",
                 )
-                log_batch_status(engine, dag_id=cfg.defaults.dag_id_stg, run_id=stg_run_id, parent_run_id=src_run, layer="STG", status="SUCCESS")
-
                 _run_step("DDS: подготовка", lambda: delete_dds_run(engine, dds_run_id), details=expected[3][1])
 
-                log_batch_status(engine, dag_id=cfg.defaults.dag_id_dds, run_id=dds_run_id, parent_run_id=stg_run_id, layer="DDS", status="PROCESSING")
+                # STG hand-off and DDS start are recorded together; a failure above marks both FAILED anyway.
+                log_batch_statuses(
+                    engine,
+                    [
+                        {"dag_id": cfg.defaults.dag_id_stg, "run_id": stg_run_id, "parent_run_id": src_run, "layer": "STG", "status": "SUCCESS"},
+                        {"dag_id": cfg.defaults.dag_id_dds, "run_id": dds_run_id, "parent_run_id": stg_run_id, "layer": "DDS", "status": "PROCESSING"},
+                    ],
+                )
                 with engine.begin() as conn:
                     _run_step(
                         "DDS: загрузка",
@@ -729,21 +831,7 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                         details=expected[5][1] if dds_mut_cfg else "мутации не заданы",
                     )
                     try:
-                        msg = conn.execute(
-                            text(
-                                """
-                                SELECT message
-                                FROM tech.etl_load_audit
-                                WHERE run_id = :run_id
-                                  AND layer = 'DDS'
-                                  AND entity_name = 'DDS_mutation'
-                                  AND status = 'MUTATED'
-                                ORDER BY audit_id DESC
-                                LIMIT 1
-                                """
-                            ),
-                            {"run_id": dds_run_id},
-                        ).scalar()
+                        msg = conn.execute(_DDS_MUTATION_AUDIT_STMT, {"run_id": dds_run_id}).scalar()
                         if msg:
                             _append_step_details("DDS: мутация", str(msg))
                     except Exception:
@@ -765,7 +853,7 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
 
             elif kind == "dds_mutation":
                 src_run = _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id)
-                dds_run_id = _make_run_id(prefix, idx, "dds")
+                dds_run_id = _make_run_id(prefix, idx, "dds", tag)
 
                 expected = [
                     ("STG: raw слой", f"используется baseline stg_run_id={src_run}"),
@@ -794,21 +882,7 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                         details=expected[3][1] if dds_mut_cfg else "мутации не заданы",
                     )
                     try:
-                        msg = conn.execute(
-                            text(
-                                """
-                                SELECT message
-                                FROM tech.etl_load_audit
-                                WHERE run_id = :run_id
-                                  AND layer = 'DDS'
-                                  AND entity_name = 'DDS_mutation'
-                                  AND status = 'MUTATED'
-                                ORDER BY audit_id DESC
-                                LIMIT 1
-                                """
-                            ),
-                            {"run_id": dds_run_id},
-                        ).scalar()
+                        msg = conn.execute(_DDS_MUTATION_AUDIT_STMT, {"run_id": dds_run_id}).scalar()
                         if msg:
                             _append_step_details("DDS: мутация", str(msg))
                     except Exception:
@@ -835,28 +909,30 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
             status = "FAILED"
             err = traceback.format_exc()
             try:
+                failed_batches: list[dict[str, str | None]] = []
                 if stg_run_id:
-                    parent = _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id)
-                    log_batch_status(
-                        engine,
-                        dag_id=cfg.defaults.dag_id_stg,
-                        run_id=stg_run_id,
-                        parent_run_id=parent,
-                        layer="STG",
-                        status="FAILED",
-                        error_message="Experiment iteration failed",
+                    failed_batches.append(
+                        {
+                            "dag_id": cfg.defaults.dag_id_stg,
+                            "run_id": stg_run_id,
+                            "parent_run_id": _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id),
+                            "layer": "STG",
+                            "status": "FAILED",
+                            "error_message": "Experiment iteration failed",
+                        }
                     )
                 if dds_run_id:
-                    parent = stg_run_id or _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id)
-                    log_batch_status(
-                        engine,
-                        dag_id=cfg.defaults.dag_id_dds,
-                        run_id=dds_run_id,
-                        parent_run_id=parent,
-                        layer="DDS",
-                        status="FAILED",
-                        error_message="Experiment iteration failed",
+                    failed_batches.append(
+                        {
+                            "dag_id": cfg.defaults.dag_id_dds,
+                            "run_id": dds_run_id,
+                            "parent_run_id": stg_run_id or _resolve_from_stg_run_id(it_cfg.from_stg_run_id, cfg.baseline.stg_run_id),
+                            "layer": "DDS",
+                            "status": "FAILED",
+                            "error_message": "Experiment iteration failed",
+                        }
                     )
+                log_batch_statuses(engine, failed_batches)
             except Exception:
                 pass
 
@@ -867,7 +943,7 @@ def run_experiment(cfg: ExperimentConfig, output_dir: Path) -> Path:
                 for k, prev in prev_env.items():
                     if prev is None:
                         os.environ.pop(k, None)
-                    else:
+                    elif os.environ.get(k) != prev:
                         os.environ[k] = prev
 
         iterations.append(
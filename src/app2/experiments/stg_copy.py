@@ -35,6 +35,39 @@ _INSERT_RAW = (
     )
 )
 
+# Rows per executemany; psycopg2 folds each batch into multi-row INSERTs.
+_INSERT_BATCH_SIZE = 1000
+
+# Server-side copy for runs without mutations. The kind classifier is generated from _KIND_PATTERNS
+# (the patterns are valid POSIX regexes too) and applied to the trimmed endpoint, like _infer_kind.
+_KIND_CASE_SQL = "CASE " + " ".join(f"WHEN ep ~ :kind_re_{i} THEN :kind_{i}" for i in range(len(_KIND_PATTERNS))) + " END"
+_KIND_PARAMS: dict[str, str] = {
+    **{f"kind_re_{i}": pat.pattern for i, (_, pat) in enumerate(_KIND_PATTERNS)},
+    **{f"kind_{i}": kind for i, (kind, _) in enumerate(_KIND_PATTERNS)},
+}
+_COPY_RAW_SQL = text(
+    f"""
+    INSERT INTO stg.raw_football_api (endpoint, request_params, http_status, response_json)
+    SELECT endpoint, CAST(:request_params AS jsonb), http_status, response_json
+    FROM (
+        SELECT id,
+               COALESCE(endpoint, '') AS endpoint,
+               http_status,
+               response_json,
+               {_KIND_CASE_SQL} AS kind
+        FROM (
+            SELECT r.*, regexp_replace(COALESCE(r.endpoint, ''), '^[[:space:]]+|[[:space:]]+$', '', 'g') AS ep
+            FROM stg.raw_football_api r
+            WHERE r.request_params ->> 'run_id' = :run_id
+              AND r.http_status BETWEEN 200 AND 299
+        ) src
+    ) classified
+    WHERE kind IS NULL
+       OR (jsonb_typeof(response_json) = 'object' AND response_json ? kind)
+    ORDER BY id
+    """
+).bindparams(bindparam("request_params", type_=JSON))
+
 
 def _infer_kind(endpoint: str) -> str | None:
     ep = (endpoint or "").strip()
@@ -57,6 +90,14 @@ def copy_stg_run_with_mutations(
     log_batch_status(engine, dag_id=dag_id, run_id=target_run_id, parent_run_id=parent_run_id, layer="STG", status="PROCESSING")
     audit_log(engine, dag_id=dag_id, run_id=target_run_id, layer="STG", entity_name="raw_football_api_copy", status="STARTED")
 
+    request_params = {"dag_id": dag_id, "run_id": target_run_id, "source_run_id": source_run_id}
+    if not apply_mutations:
+        # Nothing to rewrite: filter and copy inside Postgres, without shipping payloads through Python.
+        with engine.begin() as conn:
+            inserted = conn.execute(_COPY_RAW_SQL, {"run_id": source_run_id, "request_params": request_params, **_KIND_PARAMS}).rowcount
+        audit_log(engine, dag_id=dag_id, run_id=target_run_id, layer="STG", entity_name="raw_football_api_copy", status="SUCCESS", rows_processed=inserted)
+        return inserted
+
     with engine.begin() as conn:
         rows = conn.execute(
             text(
@@ -69,9 +110,12 @@ def copy_stg_run_with_mutations(
                 """
             ),
             {"run_id": source_run_id},
-        ).mappings().all()
+            # Payloads can be large; a server-side cursor keeps one insert batch of them in memory at a time.
+            execution_options={"stream_results": True, "max_row_buffer": _INSERT_BATCH_SIZE},
+        ).mappings()
 
         inserted = 0
+        batch: list[dict[str, Any]] = []
         for r in rows:
             endpoint = str(r.get("endpoint") or "")
             status = int(r.get("http_status") or 0)
@@ -79,19 +123,24 @@ def copy_stg_run_with_mutations(
             kind = _infer_kind(endpoint)
             if kind and (not isinstance(payload, dict) or kind not in payload):
                 continue
-            if apply_mutations and kind:
+            if kind:
                 payload, _ = mutate_payload(engine, "STG", dag_id, target_run_id, kind, payload)
 
-            conn.execute(
-                _INSERT_RAW,
+            batch.append(
                 {
                     "endpoint": endpoint,
-                    "request_params": {"dag_id": dag_id, "run_id": target_run_id, "source_run_id": source_run_id},
+                    "request_params": request_params,
                     "http_status": status,
                     "response_json": payload,
-                },
+                }
             )
-            inserted += 1
+            if len(batch) >= _INSERT_BATCH_SIZE:
+                conn.execute(_INSERT_RAW, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            conn.execute(_INSERT_RAW, batch)
+            inserted += len(batch)
 
     audit_log(engine, dag_id=dag_id, run_id=target_run_id, layer="STG", entity_name="raw_football_api_copy", status="SUCCESS", rows_processed=inserted)
     return inserted
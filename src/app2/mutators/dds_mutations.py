@@ -1,3 +1,4 @@
+import functools
 import os
 from pathlib import Path
 import yaml
@@ -8,6 +9,46 @@ from app2.db.audit import audit_log
 
 MUTATION_CONFIG_PATH = Path(__file__).resolve().parent / "configs" / "dds_mutations.yml"
 
+# Ids the mutations attach to: the run's busiest competition and a season/team from its first match,
+# falling back to the smallest dimension ids. One round trip instead of up to five lookups.
+_TARGET_IDS_SQL = text(
+    """
+    WITH top_comp AS (
+        SELECT competition_id
+        FROM dds.fact_match
+        WHERE run_id = :run_id
+          AND competition_id IS NOT NULL
+        GROUP BY competition_id
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    ),
+    pick AS (
+        SELECT season_id,
+               COALESCE(home_team_id, away_team_id) AS team_id
+        FROM dds.fact_match
+        WHERE run_id = :run_id
+          AND competition_id = (SELECT competition_id FROM top_comp)
+          AND season_id IS NOT NULL
+          AND (home_team_id IS NOT NULL OR away_team_id IS NOT NULL)
+        ORDER BY match_id
+        LIMIT 1
+    )
+    SELECT COALESCE((SELECT competition_id FROM top_comp),
+                    (SELECT min(competition_id) FROM dds.dim_competition WHERE run_id = :run_id)) AS comp_id,
+           COALESCE((SELECT season_id FROM pick),
+                    (SELECT min(season_id) FROM dds.dim_season WHERE run_id = :run_id)) AS season_id,
+           COALESCE((SELECT team_id FROM pick),
+                    (SELECT min(team_id) FROM dds.dim_team WHERE run_id = :run_id)) AS team_id
+    """
+)
+
+
+# Same (path, mtime_ns, size) keying as the STG mutation config.
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int, size: int):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
 
 def load_dds_mutation_config():
     override = os.environ.get("APP2_DDS_MUTATIONS_CONFIG")
@@ -18,10 +59,12 @@ def load_dds_mutation_config():
         config_path = p
     else:
         config_path = MUTATION_CONFIG_PATH
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         return {}
-    with config_path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    # Shared parsed config: callers only read it.
+    return _parse_config(str(config_path), st.st_mtime_ns, st.st_size)
 
 
 def mutate_dds(engine, dag_id: str, run_id: str, conn=None):
@@ -36,57 +79,11 @@ def mutate_dds(engine, dag_id: str, run_id: str, conn=None):
     def _apply(exec_conn):
         comp_id = season_id = team_id = None
         try:
-            comp_id = exec_conn.execute(
-                text(
-                    """
-                    SELECT competition_id
-                    FROM dds.fact_match
-                    WHERE run_id = :run_id
-                      AND competition_id IS NOT NULL
-                    GROUP BY competition_id
-                    ORDER BY COUNT(*) DESC
-                    LIMIT 1
-                    """
-                ),
-                {"run_id": run_id},
-            ).scalar()
-
-            if comp_id:
-                row = exec_conn.execute(
-                    text(
-                        """
-                        SELECT season_id,
-                               COALESCE(home_team_id, away_team_id) AS team_id
-                        FROM dds.fact_match
-                        WHERE run_id = :run_id
-                          AND competition_id = :comp_id
-                          AND season_id IS NOT NULL
-                          AND (home_team_id IS NOT NULL OR away_team_id IS NOT NULL)
-                        ORDER BY match_id
-                        LIMIT 1
-                        """
-                    ),
-                    {"run_id": run_id, "comp_id": comp_id},
-                ).mappings().first()
-                if row:
-                    season_id = row.get("season_id")
-                    team_id = row.get("team_id")
-
-            if not comp_id:
-                comp_id = exec_conn.execute(
-                    text("SELECT min(competition_id) FROM dds.dim_competition WHERE run_id = :run_id"),
-                    {"run_id": run_id},
-                ).scalar()
-            if not season_id:
-                season_id = exec_conn.execute(
-                    text("SELECT min(season_id) FROM dds.dim_season WHERE run_id = :run_id"),
-                    {"run_id": run_id},
-                ).scalar()
-            if not team_id:
-                team_id = exec_conn.execute(
-                    text("SELECT min(team_id) FROM dds.dim_team WHERE run_id = :run_id"),
-                    {"run_id": run_id},
-                ).scalar()
+            row = exec_conn.execute(_TARGET_IDS_SQL, {"run_id": run_id}).mappings().first()
+            if row:
+                comp_id = row.get("comp_id")
+                season_id = row.get("season_id")
+                team_id = row.get("team_id")
         except Exception:
             comp_id = season_id = team_id = None
 
@@ -1,5 +1,6 @@
 import copy
 import copy
+import functools
 import os
 import random
 from pathlib import Path
@@ -10,6 +11,13 @@ from app2.db.audit import audit_log
 MUTATION_CONFIG_PATH = Path(__file__).resolve().parent / "configs" / "stg_mutations.yml"
 
 
+# mutate_payload loads this for every copied row; mtime/size in the key re-parse an edited file.
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int, size: int):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
 def load_mutation_config():
     override = os.environ.get("APP2_STG_MUTATIONS_CONFIG")
     if override:
@@ -19,10 +27,12 @@ def load_mutation_config():
         config_path = p
     else:
         config_path = MUTATION_CONFIG_PATH
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         return {}
-    with config_path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    # Shared parsed config: callers only read it.
+    return _parse_config(str(config_path), st.st_mtime_ns, st.st_size)
 
 
 def _mutate_list(payload: dict, list_key: str, action: str, *, rng: random.Random | None = None):